@@ -16,10 +16,11 @@ from typing import (
     TypeGuard,
 )
 
-type IContext = dict[Any, Any]
+type IContext = MutableMapping[Any, Any]
 type GuardFunc = Callable[[Any, IContext], Awaitable[Any]]
 type PostHandle[R] = Callable[[Any, IContext, R], Awaitable[R]]
 type IEventContext = Mapping[Any, Any]
+type GuardLifetime = Literal["singleton", "scope", "call"]
 
 
 type CommandHandler[C] = Callable[[C, IContext], Any] | IGuard
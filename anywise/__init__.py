@@ -10,13 +10,16 @@ from .anywise import CommandHandler as CommandHandler
 from .anywise import EventListeners as EventListeners
 from .anywise import PublishStrategy as PublishStrategy
 from .anywise import SendStrategy as SendStrategy
+from .context import SlotContext as SlotContext
 from .guard import BaseGuard as BaseGuard
 from .Interface import Context as Context
 from .Interface import FrozenContext as FrozenContext
 from .Interface import GuardFunc as GuardFunc
+from .Interface import GuardLifetime as GuardLifetime
 from .Interface import IContext as IContext
 from .Interface import IGuard as IGuard
 from .registry import MessageRegistry as MessageRegistry
+from .strategies import bounded_publish as bounded_publish
 from .strategies import concurrent_publish as concurrent_publish
 
 # from . import integration as integration
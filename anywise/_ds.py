@@ -2,7 +2,13 @@ from dataclasses import dataclass
 from typing import Any, Callable
 
 from ididi.interfaces import GraphIgnore
-from .Interface import IGuard
+
+from .batch import BatchPolicy, MessageBatcher
+from .cache import ResultCache
+from .guard import GuardChain
+from .Interface import GuardLifetime, IGuard
+from .retry import RetryPolicy
+from .singleflight import SingleFlight
 
 type HandlerMapping[Command] = dict[type[Command], "FuncMeta[Command]"]
 type ListenerMapping[Event] = dict[type[Event], list[FuncMeta[Event]]]
@@ -14,6 +20,12 @@ class FuncMeta[Message]:
     is_async: bool
     is_contexted:
     whether the handler receives a context param
+    executor:
+    name of the executor that runs a sync handler, None for the default one
+    batch:
+    batching policy if the handler receives a list of messages
+    retry:
+    retry policy of a listener whose delivery fails
     """
 
     message_type: type[Message]
@@ -21,6 +33,9 @@ class FuncMeta[Message]:
     is_async: bool
     is_contexted: bool
     ignore: GraphIgnore
+    executor: str | None = None
+    batch: BatchPolicy | None = None
+    retry: RetryPolicy | None = None
 
 
 @dataclass(frozen=True, slots=True, kw_only=True)
@@ -30,5 +45,51 @@ class MethodMeta[Message](FuncMeta[Message]):
 
 @dataclass(frozen=True, slots=True, kw_only=True)
 class GuardMeta:
+    """
+    lifetime: how often a class-based guard is resolved,
+    once at include (`singleton`), once per message scope (`scope`), or on every send (`call`)
+    """
+
     guard_target: type
     guard: IGuard | type[IGuard]
+    lifetime: GuardLifetime = "scope"
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class HandlerPlan:
+    """
+    scope-independent part of a handler, compiled once per meta
+
+    handler: ready-to-call handler for functions, for methods it is the
+    unbound function to be bound to an instance of `owner_type`
+    owner_type: class to resolve from scope, None for function handlers
+    is_contexted: whether the handler receives a context param
+    name: qualified name of the registered handler, e.g. `UserService.create_user`
+    retry: retry policy of a listener
+    """
+
+    handler: Callable[..., Any]
+    owner_type: type | None
+    is_contexted: bool
+    name: str
+    retry: RetryPolicy | None = None
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class DispatchPlan:
+    """
+    everything needed to dispatch a message type, compiled once per type
+
+    chain: guards linked once, compiled when no guard has to be resolved from a scope
+    pipeline: the fully chained handler, compiled when neither the handler
+    nor any guard has to be resolved from a scope
+    """
+
+    message_type: type
+    handler: HandlerPlan
+    guards: tuple[GuardMeta, ...]
+    batcher: MessageBatcher | None = None
+    flight: SingleFlight | None = None
+    cache: ResultCache | None = None
+    chain: GuardChain | None = None
+    pipeline: Callable[..., Any] | None = None
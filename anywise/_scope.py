@@ -0,0 +1,115 @@
+from contextvars import Token
+from types import TracebackType
+from typing import Any, Awaitable, Callable, Hashable
+
+from ididi import AsyncScope, Graph
+from ididi.errors import OutOfScopeError
+from ididi.utils.param_utils import MISSING
+
+type BindHandler = Callable[[AsyncScope], Awaitable[Callable[..., Any]]]
+"returns the handler bound in the given scope"
+
+POOLING_SUPPORTED = {"_pre", "_resolution_registry", "_registered_singleton"} <= set(
+    getattr(AsyncScope, "__slots__", ())
+)
+"""
+recycling a scope sets private attributes of `AsyncScope`,
+on an ididi version without them, `ScopePool` falls back to `graph.scope()`.
+"""
+
+
+class PooledScope:
+    """
+    An async context manager that borrows an `AsyncScope` from a `ScopePool`,
+    the scope is closed on exit then recycled for the next message.
+    """
+
+    __slots__ = ("_pool", "_scope", "_token")
+
+    _scope: AsyncScope
+    _token: Token[AsyncScope]
+
+    def __init__(self, pool: "ScopePool"):
+        self._pool = pool
+
+    async def __aenter__(self) -> AsyncScope:
+        self._scope, self._token = self._pool.acquire()
+        return self._scope
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self._pool.release(
+            self._scope, self._token, exc_type, exc_value, traceback
+        )
+
+
+class ScopePool:
+    """
+    Keeps up to `maxsize` closed scopes around for reuse,
+    so that a hot path does not allocate a fresh scope for every message.
+
+    a recycled scope has its resolution cache cleared,
+    resources are always finalized before a scope goes back to the pool.
+
+    maxsize: int
+    0 disables pooling, a fresh scope is created for each message.
+    pooling is also disabled if the installed ididi is not supported, see `POOLING_SUPPORTED`.
+    """
+
+    def __init__(self, graph: Graph, *, name: Hashable = "message", maxsize: int = 0):
+        self._graph = graph
+        self._name = name
+        self._maxsize = maxsize
+        self._free: list[AsyncScope] = []
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    @property
+    def idle(self) -> int:
+        return len(self._free)
+
+    def scope(self):
+        "return an async context manager that yields a message scope"
+        if not self._maxsize or not POOLING_SUPPORTED:
+            return self._graph.scope(self._name)
+        return PooledScope(self)
+
+    def acquire(self) -> tuple[AsyncScope, Token[AsyncScope]]:
+        try:
+            pre = self._graph.use_scope()
+        except OutOfScopeError:
+            pre = MISSING
+
+        if self._free:
+            scope = self._free.pop()
+        else:
+            scope = AsyncScope(self._graph, name=self._name)
+
+        # ididi does not expose a setter for parent scope
+        scope._pre = pre  # type: ignore
+        token = self._graph.set_context_scope(scope)
+        return scope, token  # type: ignore
+
+    async def release(
+        self,
+        scope: AsyncScope,
+        token: Token[AsyncScope],
+        exc_type: type[BaseException] | None = None,
+        exc_value: BaseException | None = None,
+        traceback: TracebackType | None = None,
+    ) -> None:
+        try:
+            await scope.__aexit__(exc_type, exc_value, traceback)  # type: ignore
+        finally:
+            self._graph.reset_context_scope(token)  # type: ignore
+
+        if len(self._free) < self._maxsize:
+            scope._resolution_registry.clear()  # type: ignore
+            scope._registered_singleton.clear()  # type: ignore
+            self._free.append(scope)
@@ -1,7 +1,7 @@
 import inspect
 import sys
 from types import UnionType
-from typing import Annotated, Any, Callable, Union, get_args, get_origin
+from typing import Annotated, Any, Callable, Iterator, Union, get_args, get_origin
 
 from .errors import InvalidMessageTypeError
 
@@ -25,12 +25,6 @@ else:
     UNION_META = (Union,)
 
 
-def all_subclasses(cls: type) -> set[type]:
-    return set(cls.__subclasses__()).union(
-        *[all_subclasses(c) for c in cls.__subclasses__()]
-    )
-
-
 def gather_types(annotation: Any) -> set[type]:
     """
     Recursively gather all types from a type annotation, handling:
@@ -48,7 +42,6 @@ def gather_types(annotation: Any) -> set[type]:
     origin = get_origin(annotation)
     if not origin:
         types.add(annotation)
-        types |= all_subclasses(annotation)
     else:
         # Union types (including X | Y syntax)
         if origin is Annotated:
@@ -62,3 +55,16 @@ def gather_types(annotation: Any) -> set[type]:
             # Generic type, e.g. List, Dict, etc.
             raise InvalidMessageTypeError(origin)
     return types
+
+
+def iter_subclasses(base: type) -> Iterator[type]:
+    "every subclass of `base` that exists now, direct or not, each yielded once"
+    seen: set[type] = set()
+    stack = list(type.__subclasses__(base))
+    while stack:
+        sub = stack.pop()
+        if sub in seen:
+            continue
+        seen.add(sub)
+        yield sub
+        stack.extend(type.__subclasses__(sub))
@@ -1,16 +1,31 @@
-from asyncio import to_thread
+from asyncio import TaskGroup
 from collections import defaultdict
-from functools import partial
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import partial, wraps
+from inspect import signature
+from itertools import chain
 from types import MethodType
-from typing import Any, Callable, Sequence, cast
+from typing import AbstractSet, Any, Awaitable, Callable, Mapping, Self, Sequence, cast
 from weakref import ref
 
 from ididi import AsyncScope, Graph
-
-from ._ds import FuncMeta, GuardMeta, MethodMeta
+from ididi.utils.param_utils import is_provided
+from ididi.utils.typing_utils import get_full_typed_signature
+
+from ._ds import DispatchPlan, FuncMeta, GuardMeta, HandlerPlan, MethodMeta
+from ._scope import ScopePool
+from ._visitor import iter_subclasses
+from .batch import MessageBatcher
+from .cache import CachePolicy, CacheStats, ResultCache
+from .coalesce import CoalescePolicy, EventCoalescer
+from .context import EMPTY_CONTEXT
 from .errors import SinkUnsetError, UnregisteredMessageError
+from .executor import Executors, ExecutorStats, IExecutor
+from .guard import GuardChain
 from .Interface import (
     CommandHandler,
+    EventListener,
     EventListeners,
     IContext,
     IEventContext,
@@ -21,55 +36,171 @@ from .Interface import (
 )
 from .messages import IEvent
 from .registry import GuardMapping, HandlerMapping, ListenerMapping, MessageRegistry
+from .retry import DeadLetter, Redelivery, RetryPolicy
+from .runtime import Runtime, RuntimeStats
+from .singleflight import SingleFlight
 from .sink import IEventSink
 from .strategies import default_publish, default_send
 
 
 def context_wrapper(origin: Callable[[Any], Any]):
+    @wraps(origin)
     async def inner(message: Any, _: Any):
         return await origin(message)
 
     return inner
 
 
+def executor_wrapper(executor: IExecutor, origin: Callable[..., Any]):
+    """
+    run the sync `origin` in `executor`,
+    dependencies are resolved on the loop by `dg.entry` and passed along with the message.
+    """
+
+    @wraps(origin)
+    async def inner(*args: Any, **kwargs: Any):
+        return await executor.run(origin, *args, **kwargs)
+
+    # annotations are evaluated in the module of `origin`, not this one
+    setattr(inner, "__signature__", get_full_typed_signature(origin))
+    return inner
+
+
+@dataclass(slots=True)
+class EventBuffer:
+    """
+    events published on `owner` while one of its commands is handled, flushed once it succeeds.
+    a closed buffer no longer accepts events, e.g. from tasks that outlive the command.
+    """
+
+    owner: object
+    events: list[tuple[IEvent, IEventContext | None, bool]] = field(
+        default_factory=list[tuple[IEvent, IEventContext | None, bool]]
+    )
+    closed: bool = False
+
+
+_event_buffer: ContextVar[EventBuffer | None] = ContextVar(
+    "anywise_event_buffer", default=None
+)
+
+
+async def _raise(exc: Exception, *_: Any) -> Any:
+    raise exc
+
+
+def wrap_handler(
+    handler: Callable[..., Any],
+    flight: SingleFlight | None,
+    cache: ResultCache | None,
+) -> Callable[..., Any]:
+    if flight:
+        handler = partial(flight.call, handler)
+    if cache:
+        handler = partial(cache.call, handler)
+    return handler
+
+
+def is_direct_handler(meta: FuncMeta[Any]) -> bool:
+    "an async function whose only param is the message"
+    return (
+        meta.is_async
+        and not meta.is_contexted
+        and not isinstance(meta, MethodMeta)
+        and len(signature(meta.handler).parameters) == 1
+    )
+
+
 class ManagerBase:
-    def __init__(self, dg: Graph):
+    def __init__(self, dg: Graph, executors: Executors | None = None):
         self._dg = dg
+        self._executors = executors or Executors()
 
-    async def _resolve_meta(self, meta: "FuncMeta[Any]", *, scope: AsyncScope):
+    def _compile_meta(self, meta: "FuncMeta[Any]") -> HandlerPlan:
         handler = meta.handler
 
         if not meta.is_async:
-            # TODO: manage ThreadExecutor ourselves to allow config max worker
-            # by default is min(32, cpu_cores + 4)
-            handler = partial(to_thread, cast(Any, handler))
+            handler = executor_wrapper(self._executors[meta.executor], handler)
 
         if isinstance(meta, MethodMeta):
-            instance = await scope.resolve(meta.owner_type)
-            handler = MethodType(handler, instance)
-        else:
-            # TODO: EntryFunc
-            handler = self._dg.entry(ignore=meta.ignore)(handler)
+            return HandlerPlan(
+                handler=handler,
+                owner_type=meta.owner_type,
+                is_contexted=meta.is_contexted,
+                name=meta.handler.__qualname__,
+                retry=meta.retry,
+            )
 
+        # TODO: EntryFunc
+        handler = self._dg.entry(ignore=meta.ignore)(handler)
         if not meta.is_contexted:
             handler = context_wrapper(handler)
+        return HandlerPlan(
+            handler=handler,
+            owner_type=None,
+            is_contexted=True,
+            name=meta.handler.__qualname__,
+            retry=meta.retry,
+        )
+
+    async def _bind_plan(self, plan: HandlerPlan, scope: AsyncScope):
+        if plan.owner_type is None:
+            return plan.handler
+
+        instance = await scope.resolve(plan.owner_type)
+        handler = MethodType(plan.handler, instance)
+        if not plan.is_contexted:
+            handler = context_wrapper(handler)
         return handler
 
 
 class HandlerManager(ManagerBase):
-    def __init__(self, dg: Graph):
-        super().__init__(dg)
+    def __init__(
+        self,
+        dg: Graph,
+        executors: Executors | None = None,
+        scopes: ScopePool | None = None,
+    ):
+        super().__init__(dg, executors)
+        self._scopes = scopes or ScopePool(dg)
         self._handler_metas: dict[type, FuncMeta[Any]] = {}
         self._guard_mapping: GuardMapping = defaultdict(list)
         self._global_guards: list[GuardMeta] = []
+        self._plans: dict[type, DispatchPlan] = {}
+        self._batchers: dict[Callable[..., Any], MessageBatcher] = {}
+        self._single_flight_types: set[type] = set()
+        self._caches: dict[type, ResultCache] = {}
+        self._evictions: dict[type, tuple[ResultCache, ...]] = {}
+        self._singletons: dict[type, IGuard] = {}
+        self._direct_handlers: dict[type, Callable[[Any], Any]] = {}
+        self._context_free: set[type] = set()
 
     @property
     def global_guards(self):
         return self._global_guards[:]
 
+    @property
+    def direct_handlers(self) -> Mapping[type, Callable[[Any], Any]]:
+        """
+        async function handlers that can be awaited with the message alone,
+        they have no guard, no context, no dependency and no batch / single flight / cache.
+        """
+        return self._direct_handlers
+
+    @property
+    def context_free(self) -> AbstractSet[type]:
+        "message types whose handler and guards never see the context"
+        return self._context_free
+
+    def _reset_plans(self) -> None:
+        self._plans.clear()
+        self._direct_handlers.clear()
+        self._context_free.clear()
+
     def include_handlers(self, command_mapping: HandlerMapping[Any]):
         handler_mapping = {msg_type: meta for msg_type, meta in command_mapping.items()}
         self._handler_metas.update(handler_mapping)
+        self._reset_plans()
 
     def include_guards(self, guard_mapping: GuardMapping):
         for origin_target, guard_meta in guard_mapping.items():
@@ -77,67 +208,220 @@ class HandlerManager(ManagerBase):
                 self._global_guards.extend(guard_meta)
             else:
                 self._guard_mapping[origin_target].extend(guard_meta)
+        self._reset_plans()
+
+    def include_single_flight(self, msg_types: set[type]):
+        self._single_flight_types |= msg_types
+        self._reset_plans()
+
+    def include_caches(self, cache_policies: Mapping[type, CachePolicy]):
+        for msg_type, policy in cache_policies.items():
+            self._caches[msg_type] = ResultCache(policy)
+        self._reset_plans()
+        self._evictions.clear()
+
+    def compile(self) -> None:
+        "compile a dispatch plan for every registered message type"
+        self._reset_plans()
+        self._batchers.clear()
+        self._singletons.clear()
+        for msg_type in self._handler_metas:
+            self._compile_plan(msg_type)
+
+    def _lookup_meta(self, msg_type: type) -> FuncMeta[Any] | None:
+        "find the handler of the most specific type in `msg_type.__mro__`"
+        for base in msg_type.__mro__:
+            if meta := self._handler_metas.get(base):
+                return meta
+        return None
+
+    def _lookup_guards(self, msg_type: type) -> list[GuardMeta]:
+        """
+        global guards, then guards of each type in `msg_type.__mro__`,
+        from base to derived, so that guards of a base type wrap those of its subtypes.
+        """
+        guards: list[GuardMeta] = []
+        seen: set[int] = set()
+        mro_guards = [
+            self._guard_mapping.get(base, []) for base in reversed(msg_type.__mro__)
+        ]
+        for meta in chain(self._global_guards, *mro_guards):
+            if id(meta.guard) in seen:
+                continue
+            seen.add(id(meta.guard))
+            guards.append(meta)
+        return guards
+
+    def _lookup_cache(self, msg_type: type) -> ResultCache | None:
+        for base in msg_type.__mro__:
+            if cache := self._caches.get(base):
+                return cache
+        return None
+
+    def _compile_plan(self, msg_type: type) -> DispatchPlan:
+        if (meta := self._lookup_meta(msg_type)) is None:
+            raise UnregisteredMessageError(msg_type)
 
-    async def _chain_guards[
-        C
-    ](
-        self,
-        msg_type: type[C],
-        handler: Callable[..., Any],
-        *,
-        scope: AsyncScope,
-    ) -> CommandHandler[C]:
-        command_guards = self._global_guards + self._guard_mapping[msg_type]
-        if not command_guards:
-            return handler
+        handler = self._compile_meta(meta)
+        guards = tuple(
+            self._resolve_singleton(meta) for meta in self._lookup_guards(msg_type)
+        )
+        batcher = self._get_batcher(meta, handler)
+        flight = (
+            SingleFlight(
+                bind=partial(self._bind_terminal, handler, batcher),
+                scopes=self._scopes,
+            )
+            if self._single_flight_types.intersection(msg_type.__mro__)
+            else None
+        )
+        cache = self._lookup_cache(msg_type)
+
+        if not guards and not (batcher or flight or cache) and is_direct_handler(meta):
+            self._direct_handlers[msg_type] = meta.handler
+        if not guards and not meta.is_contexted:
+            self._context_free.add(msg_type)
+
+        chain = pipeline = None
+        if guards and not any(isinstance(meta.guard, type) for meta in guards):
+            chain = GuardChain([cast(IGuard, meta.guard) for meta in guards])
+
+        # a batch binds the handler in a scope of its own
+        if (batcher or handler.owner_type is None) and (chain or not guards):
+            terminal = batcher.submit if batcher else handler.handler
+            pipeline = wrap_handler(terminal, flight, cache)
+            if chain:
+                pipeline = partial(chain, pipeline)
+
+        plan = DispatchPlan(
+            message_type=msg_type,
+            handler=handler,
+            guards=guards,
+            batcher=batcher,
+            flight=flight,
+            cache=cache,
+            chain=chain,
+            pipeline=pipeline,
+        )
+        self._plans[msg_type] = plan
+        return plan
+
+    async def _bind_terminal(
+        self, plan: HandlerPlan, batcher: MessageBatcher | None, scope: AsyncScope
+    ) -> Callable[..., Any]:
+        "the innermost handler of a dispatch, a batcher binds the handler in a scope of its own"
+        if batcher:
+            return batcher.submit
+        return await self._bind_plan(plan, scope)
+
+    def _get_batcher(
+        self, meta: FuncMeta[Any], plan: HandlerPlan
+    ) -> MessageBatcher | None:
+        "message types handled by the same handler share a batcher"
+        if meta.batch is None:
+            return None
 
-        guards: list[IGuard] = [
-            (
-                await scope.resolve(meta.guard)
-                if isinstance(meta.guard, type)
-                else meta.guard
+        if (batcher := self._batchers.get(meta.handler)) is None:
+            batcher = self._batchers[meta.handler] = MessageBatcher(
+                meta.batch,
+                bind=partial(self._bind_plan, plan),
+                scopes=self._scopes,
             )
-            for meta in command_guards
-        ]
+        return batcher
 
-        head, *rest = guards
-        ptr = head
+    def _resolve_singleton(self, meta: GuardMeta) -> GuardMeta:
+        "replace a singleton guard class with its instance, shared by every message type"
+        if meta.lifetime != "singleton" or not isinstance(meta.guard, type):
+            return meta
 
-        for nxt in rest:
-            ptr.chain_next(nxt)
-            ptr = nxt
+        if (guard := self._singletons.get(meta.guard)) is None:
+            guard = self._singletons[meta.guard] = self._dg.resolve(meta.guard)
+        return GuardMeta(
+            guard_target=meta.guard_target, guard=guard, lifetime="singleton"
+        )
 
-        ptr.chain_next(handler)
-        return head
+    async def _resolve_guard(self, meta: GuardMeta, *, scope: AsyncScope) -> IGuard:
+        guard_type = meta.guard
+        if not isinstance(guard_type, type):
+            return guard_type
 
-    def get_handler[C](self, msg_type: type[C]) -> CommandHandler[C] | None:
+        if meta.lifetime == "call":
+            return await scope.resolve(guard_type)
+
+        if is_provided(guard := scope.get_cached(guard_type)):
+            return guard
+        guard = await scope.resolve(guard_type)
+        scope.cache_result(guard_type, guard)
+        return guard
+
+    async def _resolve_guards(
+        self, command_guards: Sequence[GuardMeta], *, scope: AsyncScope
+    ) -> list[IGuard]:
+        return [await self._resolve_guard(meta, scope=scope) for meta in command_guards]
+
+    def evict(self, event_type: type) -> None:
+        "clear caches that are evicted on `event_type` or any of its bases"
         try:
-            meta = self._handler_metas[msg_type]
+            caches = self._evictions[event_type]
         except KeyError:
+            caches = self._evictions[event_type] = tuple(
+                cache
+                for cache in self._caches.values()
+                if any(issubclass(event_type, t) for t in cache.policy.evict_on)
+            )
+
+        for cache in caches:
+            cache.clear()
+
+    def cache_stats(self) -> dict[type, CacheStats]:
+        return {msg_type: cache.stats for msg_type, cache in self._caches.items()}
+
+    def get_handler[C](self, msg_type: type[C]) -> CommandHandler[C] | None:
+        if (meta := self._lookup_meta(msg_type)) is None:
             return None
-        else:
-            return meta.handler
+        return meta.handler
 
     def get_guards(self, msg_type: type) -> list[IGuard | type[IGuard]]:
-        return [meta.guard for meta in self._guard_mapping[msg_type]]
+        global_guards = set(id(meta.guard) for meta in self._global_guards)
+        return [
+            meta.guard
+            for meta in self._lookup_guards(msg_type)
+            if id(meta.guard) not in global_guards
+        ]
 
     async def resolve_handler[C](self, msg_type: type[C], scope: AsyncScope):
         try:
-            meta = self._handler_metas[msg_type]
+            plan = self._plans[msg_type]
         except KeyError:
-            raise UnregisteredMessageError(msg_type)
+            plan = self._compile_plan(msg_type)
 
-        resolved_handler = await self._resolve_meta(meta, scope=scope)
-        guarded_handler = await self._chain_guards(
-            msg_type, resolved_handler, scope=scope
-        )
-        return guarded_handler
+        if plan.pipeline is not None:
+            return plan.pipeline
+
+        handler = await self._bind_terminal(plan.handler, plan.batcher, scope)
+        handler = wrap_handler(handler, plan.flight, plan.cache)
+        if not plan.guards:
+            return handler
+        if (chain := plan.chain) is None:
+            chain = GuardChain(await self._resolve_guards(plan.guards, scope=scope))
+        return partial(chain, handler)
 
 
 class ListenerManager(ManagerBase):
-    def __init__(self, dg: Graph):
-        super().__init__(dg)
+    def __init__(
+        self,
+        dg: Graph,
+        executors: Executors | None = None,
+        redelivery: Redelivery | None = None,
+    ):
+        super().__init__(dg, executors)
+        self._redelivery = redelivery
         self._listener_metas: dict[type, list[FuncMeta[Any]]] = dict()
+        self._plans: dict[type, tuple[HandlerPlan, ...]] = {}
+        self._publishers: dict[type, PublishStrategy[Any]] = {}
+        self._type_publishers: dict[type, PublishStrategy[Any] | None] = {}
+        self._coalescers: dict[type, EventCoalescer] = {}
+        self._type_coalescers: dict[type, EventCoalescer | None] = {}
 
     def include_listeners(self, event_mapping: ListenerMapping[Any]):
         listener_mapping = {
@@ -150,14 +434,85 @@ class ListenerManager(ManagerBase):
                 self._listener_metas[msg_type] = metas
             else:
                 self._listener_metas[msg_type].extend(metas)
+        self._plans.clear()
 
-    def get_listeners[E](self, msg_type: type[E]) -> EventListeners[E]:
+    def include_publishers(self, publishers: Mapping[type, PublishStrategy[Any]]):
+        self._publishers.update(publishers)
+        self._type_publishers.clear()
+
+    def get_publisher(self, msg_type: type) -> PublishStrategy[Any] | None:
+        "the publisher of the most specific type in `msg_type.__mro__`, if any"
         try:
-            listener_metas = self._listener_metas[msg_type]
+            return self._type_publishers[msg_type]
         except KeyError:
-            return []
-        else:
-            return [meta.handler for meta in listener_metas]
+            publisher = next(
+                (p for t in msg_type.__mro__ if (p := self._publishers.get(t))), None
+            )
+            self._type_publishers[msg_type] = publisher
+            return publisher
+
+    def include_coalescers(self, policies: Mapping[type, CoalescePolicy]):
+        for event_type, policy in policies.items():
+            self._coalescers[event_type] = EventCoalescer(policy)
+        self._type_coalescers.clear()
+
+    def get_coalescer(self, msg_type: type) -> EventCoalescer | None:
+        "the coalescer of the most specific type in `msg_type.__mro__`, if any"
+        try:
+            return self._type_coalescers[msg_type]
+        except KeyError:
+            coalescer = next(
+                (c for t in msg_type.__mro__ if (c := self._coalescers.get(t))), None
+            )
+            self._type_coalescers[msg_type] = coalescer
+            return coalescer
+
+    def flush_coalescers(self) -> None:
+        for coalescer in self._coalescers.values():
+            coalescer.flush()
+
+    def compile(self) -> None:
+        """
+        compile the fan-out of every registered event type and of its existing subclasses,
+        subclasses defined later are compiled on their first publish.
+        """
+        self._plans.clear()
+        for msg_type in self._listener_metas:
+            if msg_type not in self._plans:
+                self._compile_plans(msg_type)
+
+            if msg_type is object:
+                continue
+
+            for sub_type in iter_subclasses(msg_type):
+                if sub_type not in self._plans:
+                    self._compile_plans(sub_type)
+
+    def _lookup_metas(self, msg_type: type) -> list[FuncMeta[Any]]:
+        """
+        listeners of every type in `msg_type.__mro__`, from base to derived,
+        a listener registered for multiple types in the mro is only included once.
+        """
+        metas: list[FuncMeta[Any]] = []
+        seen: set[Callable[..., Any]] = set()
+        for base in reversed(msg_type.__mro__):
+            for meta in self._listener_metas.get(base, []):
+                if meta.handler in seen:
+                    continue
+                seen.add(meta.handler)
+                metas.append(meta)
+        return metas
+
+    def _compile_plans(self, msg_type: type) -> tuple[HandlerPlan, ...]:
+        if not (listener_metas := self._lookup_metas(msg_type)):
+            raise UnregisteredMessageError(msg_type)
+
+        plans = tuple(self._compile_meta(meta) for meta in listener_metas)
+        self._plans[msg_type] = plans
+        return plans
+
+    def get_listeners[E](self, msg_type: type[E]) -> EventListeners[E]:
+        return [meta.handler for meta in self._lookup_metas(msg_type)]
 
     # def replace_listener(self, msg_type: type, old, new):
     #    idx = self._listener_metas[msg_type].index(old)
@@ -167,14 +522,42 @@ class ListenerManager(ManagerBase):
         E
     ](self, msg_type: type[E], *, scope: AsyncScope) -> EventListeners[E]:
         try:
-            listener_metas = self._listener_metas[msg_type]
+            plans = self._plans[msg_type]
         except KeyError:
-            raise UnregisteredMessageError(msg_type)
-        else:
-            resolved_listeners = [
-                await self._resolve_meta(meta, scope=scope) for meta in listener_metas
-            ]
-            return resolved_listeners
+            plans = self._compile_plans(msg_type)
+
+        listeners: list[EventListener[E]] = []
+        for plan in plans:
+            listener = await self._bind_plan(plan, scope=scope)
+            if plan.retry and self._redelivery:
+                listener = partial(self._deliver, plan, listener)
+            listeners.append(listener)
+        return listeners
+
+    async def _deliver(
+        self,
+        plan: HandlerPlan,
+        listener: EventListener[Any],
+        msg: Any,
+        context: IEventContext,
+    ) -> None:
+        "deliver once inline, failed deliveries are retried in the background"
+        try:
+            await listener(msg, context)
+        except Exception as exc:
+            cast(Redelivery, self._redelivery).schedule(
+                partial(self._redeliver, plan, msg, context),
+                cast(RetryPolicy, plan.retry),
+                event=msg,
+                listener=plan.name,
+                error=exc,
+            )
+
+    async def _redeliver(
+        self, plan: HandlerPlan, msg: Any, context: IEventContext, scope: AsyncScope
+    ) -> None:
+        listener = await self._bind_plan(plan, scope=scope)
+        await listener(msg, context)
 
 
 class Inspect:
@@ -183,10 +566,16 @@ class Inspect:
     """
 
     def __init__(
-        self, handler_manager: HandlerManager, listener_manager: ListenerManager
+        self,
+        handler_manager: HandlerManager,
+        listener_manager: ListenerManager,
+        executors: Executors | None = None,
+        runtime: Runtime | None = None,
     ):
         self._hm = ref(handler_manager)
         self._lm = ref(listener_manager)
+        self._executors = ref(executors) if executors else None
+        self._runtime = ref(runtime) if runtime else None
 
     def listeners[E](self, key: type[E]) -> EventListeners[E] | None:
         if (lm := self._lm()) and (listeners := lm.get_listeners(key)):
@@ -206,6 +595,23 @@ class Inspect:
         command_guards = hm.get_guards(msg_type=key)
         return global_guards + command_guards
 
+    def caches(self) -> dict[type, CacheStats]:
+        "hit / miss stats of each query cache, keyed by the cached message type"
+        if hm := self._hm():
+            return hm.cache_stats()
+        return {}
+
+    def executors(self) -> dict[str, ExecutorStats]:
+        "worker and queue depth stats of each executor, keyed by executor name"
+        if self._executors and (executors := self._executors()):
+            return executors.stats()
+        return {}
+
+    def runtime(self) -> RuntimeStats | None:
+        "pending / running / failed background tasks"
+        if self._runtime and (runtime := self._runtime()):
+            return runtime.stats
+
 
 class Anywise:
     """
@@ -226,6 +632,47 @@ class Anywise:
             for listener in listeners:
                 await listener(msg, context)
         ```
+
+    - executors: `Mapping[str, int | None | IExecutor]`
+
+        named executors that run sync handlers, mapping executor name to max workers
+        of a thread pool, or to an executor instance such as `ProcessExecutor`.
+        a `default` thread executor is always created, select one via
+        `MessageRegistry(executor=...)` or `MessageRegistry.register(..., executor=...)`.
+
+        ```py
+        aw = Anywise(
+            registry,
+            executors={"default": 16, "db": 4, "cpu": ProcessExecutor(max_workers=4)},
+        )
+        ```
+
+    - scope_pool_size: `int`
+
+        number of closed message scopes kept for reuse, 0 disables pooling.
+        a message scope is always closed after `send` / `publish` returns.
+
+    - runtime: `Runtime`
+
+        supervises background publishes, `publish(event, background=True)`,
+        drained on `shutdown`.
+
+        ```py
+        aw = Anywise(registry, runtime=Runtime(max_concurrency=50, on_error=report))
+        ```
+
+    - dead_letter: `IEventSink[DeadLetter]`
+
+        where deliveries of listeners registered with a `RetryPolicy` end up
+        once every attempt failed, see `MessageRegistry.register(..., retry=...)`.
+
+    - defer_events: `bool`
+
+        if True, events published while a command is handled are buffered,
+        and only published after the handler returns, discarded if it raises.
+        with `send_many`, each message has a buffer of its own.
+        buffered events are sunk with one `sink` call, if a sink is set,
+        then published in one shared message scope.
     """
 
     def __init__(
@@ -235,17 +682,45 @@ class Anywise:
         sink: IEventSink[IEvent] | None = None,
         sender: SendStrategy[Any] = default_send,
         publisher: PublishStrategy[IEvent] = default_publish,
+        executors: Mapping[str, int | None | IExecutor] | None = None,
+        scope_pool_size: int = 0,
+        runtime: Runtime | None = None,
+        dead_letter: IEventSink[DeadLetter] | None = None,
+        defer_events: bool = False,
     ):
         self._dg = graph or Graph()
-        self._handler_manager = HandlerManager(self._dg)
-        self._listener_manager = ListenerManager(self._dg)
+        self._scope_pool = ScopePool(self._dg, name="message", maxsize=scope_pool_size)
+        self._executors = Executors(executors)
+        self._runtime = runtime or Runtime()
+        self._handler_manager = HandlerManager(
+            self._dg, self._executors, self._scope_pool
+        )
+        self._listener_manager = ListenerManager(
+            self._dg,
+            self._executors,
+            Redelivery(self._runtime, self._scope_pool, dead_letter),
+        )
 
         self._sender = sender
         self._publisher = publisher
         self._sink = sink
+        self._defer_events = defer_events
+        self._dead_letter = dead_letter
+        # a custom sender must see every handler, so direct calls are only made for the default one
+        self._direct_handlers: Mapping[type, Callable[[Any], Any]] = (
+            self._handler_manager.direct_handlers
+            if sender is default_send
+            else dict[type, Callable[[Any], Any]]()
+        )
+        # a custom sender may write to the context it is given, it always gets its own
+        self._context_free: AbstractSet[type] = (
+            self._handler_manager.context_free
+            if sender is default_send
+            else set[type]()
+        )
 
-        self.include(*registries)
         self._dg.register_singleton(self)
+        self.include(*registries)
 
     @property
     def sender(self) -> SendStrategy[Any]:
@@ -261,17 +736,44 @@ class Anywise:
 
     def reset_graph(self) -> None:
         self._dg.reset(clear_nodes=True)
+        self._handler_manager.compile()
+        self._listener_manager.compile()
 
-    # async def __enter__(self):
-    #     """create an global scope and create resource"""
-    #     # scope = self._dg.scope("anywise")
+    async def __aenter__(self) -> Self:
+        return self
 
-    # async def __aexit__(
-    #     self,
-    #     exc_type: type[Exception] | None,
-    #     exc: Exception | None,
-    #     exc_tb: Any | None,
-    # ): ...
+    async def __aexit__(
+        self,
+        exc_type: type[Exception] | None,
+        exc: Exception | None,
+        exc_tb: Any | None,
+    ) -> None:
+        await self.shutdown()
+
+    async def shutdown(self, timeout: float | None = None) -> None:
+        """
+        drain background publishes, close sinks, then release resources owned by anywise,
+        e.g. thread executors. background tasks still running after `timeout` are cancelled.
+
+        every sink is closed and executors are released even if closing a sink fails,
+        the errors are then raised together as an `ExceptionGroup`.
+        """
+        errors: list[Exception] = []
+        try:
+            self._listener_manager.flush_coalescers()
+            await self._runtime.shutdown(timeout)
+            for sink in (self._sink, self._dead_letter):
+                # e.g. `BatchingSink` flushes buffered events on close
+                if close := getattr(sink, "close", None):
+                    try:
+                        await close()
+                    except Exception as exc:
+                        errors.append(exc)
+        finally:
+            self._executors.shutdown(wait=False)
+
+        if errors:
+            raise ExceptionGroup("closing event sinks failed", errors)
 
     def register(
         self, message_type: type | None = None, *registee: tuple[Registee, ...]
@@ -291,6 +793,8 @@ class Anywise:
         return Inspect(
             handler_manager=self._handler_manager,
             listener_manager=self._listener_manager,
+            executors=self._executors,
+            runtime=self._runtime,
         )
 
     def include(self, *registries: MessageRegistry[Any, Any]) -> None:
@@ -298,8 +802,16 @@ class Anywise:
             self._dg.merge(msg_registry.graph)
             self._handler_manager.include_handlers(msg_registry.command_mapping)
             self._handler_manager.include_guards(msg_registry.guard_mapping)
+            self._handler_manager.include_single_flight(
+                msg_registry.single_flight_types
+            )
+            self._handler_manager.include_caches(msg_registry.cache_policies)
             self._listener_manager.include_listeners(msg_registry.event_mapping)
+            self._listener_manager.include_publishers(msg_registry.publishers)
+            self._listener_manager.include_coalescers(msg_registry.coalesce_policies)
         self._dg.analyze_nodes()
+        self._handler_manager.compile()
+        self._listener_manager.compile()
 
     def scope(self, name: str | None = None):
         return self._dg.scope(name)
@@ -311,26 +823,194 @@ class Anywise:
         context: IContext | None = None,
         scope: AsyncScope | None = None,
     ) -> Any:
+        if self._defer_events and self._event_buffer() is None:
+            return await self._deferred(
+                partial(self.send, msg, context=context, scope=scope)
+            )
+
+        if handler := self._direct_handlers.get(type(msg)):
+            # nothing to resolve, guard or wrap, skip the scope and the context
+            return await handler(msg)
+
+        if context is None and type(msg) in self._context_free:
+            # nothing reads or writes the context, share one instead of a dict per send
+            context = cast(IContext, EMPTY_CONTEXT)
+
         if scope is None:
-            scope = await self._dg.scope("message").__aenter__()
+            async with self._scope_pool.scope() as scope:
+                handler = await self._handler_manager.resolve_handler(type(msg), scope)
+                return await self._sender(msg, context, handler)
 
         handler = await self._handler_manager.resolve_handler(type(msg), scope)
         return await self._sender(msg, context, handler)
 
+    def _event_buffer(self) -> EventBuffer | None:
+        "the open buffer of a command handled by this instance, if any"
+        buffer = _event_buffer.get()
+        if buffer is None or buffer.owner is not self or buffer.closed:
+            return None
+        return buffer
+
+    async def _deferred(self, send: Callable[[], Awaitable[Any]]) -> Any:
+        "run `send` with an event buffer, nested sends share it"
+        buffer = EventBuffer(owner=self)
+        token = _event_buffer.set(buffer)
+        try:
+            result = await send()
+        finally:
+            buffer.closed = True
+            _event_buffer.reset(token)
+
+        if buffer.events:
+            await self._flush_events(buffer.events)
+        return result
+
+    async def _flush_events(
+        self, events: list[tuple[IEvent, IEventContext | None, bool]]
+    ) -> None:
+        if self._sink is not None:
+            await self._sink.sink([event for event, *_ in events])
+
+        async with self._scope_pool.scope() as scope:
+            for event, context, background in events:
+                await self.publish(
+                    event, context=context, scope=scope, background=background
+                )
+
+    async def send_many(
+        self,
+        msgs: Sequence[object],
+        *,
+        context: IContext | None = None,
+        scope: AsyncScope | None = None,
+        concurrency: int = 1,
+        return_exceptions: bool = True,
+    ) -> list[Any]:
+        """
+        send a batch of messages, results are returned in the order of `msgs`.
+
+        up to `concurrency` messages are handled at the same time, each in a message scope
+        of its own, as with `send`, dispatch plans are compiled once per message type.
+        all messages share `scope` if provided, the handler of each message type
+        is then resolved once in it.
+
+        return_exceptions: if True, an exception raised for a message is returned in its place,
+        otherwise the first exception is raised.
+        """
+        if scope is None:
+            send = partial(self.send, context=context)
+        else:
+            send = await self._shared_sender(msgs, context, scope, return_exceptions)
+
+        results: list[Any] = [None] * len(msgs)
+        indices = iter(range(len(msgs)))
+
+        async def worker():
+            for idx in indices:
+                try:
+                    results[idx] = await send(msgs[idx])
+                except Exception as exc:
+                    if not return_exceptions:
+                        raise
+                    results[idx] = exc
+
+        if concurrency <= 1 or len(msgs) <= 1:
+            await worker()
+            return results
+
+        try:
+            async with TaskGroup() as tg:
+                for _ in range(min(concurrency, len(msgs))):
+                    tg.create_task(worker())
+        except ExceptionGroup as eg:
+            raise eg.exceptions[0]
+        return results
+
+    async def _shared_sender(
+        self,
+        msgs: Sequence[object],
+        context: IContext | None,
+        scope: AsyncScope,
+        return_exceptions: bool,
+    ) -> Callable[[object], Awaitable[Any]]:
+        "resolve the handler of each message type once in `scope`"
+        handlers: dict[type, tuple[IContext | None, CommandHandler[Any]]] = {}
+        for msg_type in dict.fromkeys(map(type, msgs)):
+            msg_context = context
+            if context is None and msg_type in self._context_free:
+                msg_context = cast(IContext, EMPTY_CONTEXT)
+            try:
+                handler = await self._handler_manager.resolve_handler(msg_type, scope)
+            except Exception as exc:
+                if not return_exceptions:
+                    raise
+                handler = partial(_raise, exc)
+            handlers[msg_type] = (msg_context, handler)
+
+        defer = self._defer_events and self._event_buffer() is None
+
+        async def send(msg: object) -> Any:
+            call = partial(self._sender, msg, *handlers[type(msg)])
+            if defer:
+                return await self._deferred(call)
+            return await call()
+
+        return send
+
     async def publish(
         self,
         msg: IEvent,
         *,
         context: IEventContext | None = None,
         scope: AsyncScope | None = None,
+        background: bool = False,
+    ) -> None:
+        """
+        background: if True, return immediately and let the runtime run the listeners,
+        in a message scope of their own, `scope` is ignored.
+        failures are reported to the runtime's `on_error` hook.
+
+        with `defer_events`, an event published while a command is handled
+        is buffered, and published after the command succeeds.
+
+        an event of a coalesced type is held, then published in the background
+        after its window, see `MessageRegistry.coalesce`.
+        """
+        if buffer := self._event_buffer():
+            buffer.events.append((msg, context, background))
+            return
+
+        self._handler_manager.evict(type(msg))
+
+        if coalescer := self._listener_manager.get_coalescer(type(msg)):
+            coalescer.submit(self._publish_background, msg, context)
+            return
+
+        if background:
+            self._publish_background(msg, context)
+            return
+
+        await self._publish(msg, context, scope)
+
+    def _publish_background(self, msg: IEvent, context: IEventContext | None) -> None:
+        self._runtime.spawn(self._publish(msg, context, None), message=msg)
+
+    async def _publish(
+        self, msg: IEvent, context: IEventContext | None, scope: AsyncScope | None
     ) -> None:
+        publisher = self._listener_manager.get_publisher(type(msg)) or self._publisher
+
         if scope is None:
-            scope = await self._dg.scope("message").__aenter__()
+            async with self._scope_pool.scope() as scope:
+                resolved_listeners = await self._listener_manager.resolve_listeners(
+                    type(msg), scope=scope
+                )
+                return await publisher(msg, context, resolved_listeners)
 
         resolved_listeners = await self._listener_manager.resolve_listeners(
             type(msg), scope=scope
         )
-        return await self._publisher(msg, context, resolved_listeners)
+        return await publisher(msg, context, resolved_listeners)
 
     # def add_task[
     #     **P, R
@@ -0,0 +1,95 @@
+from asyncio import Future, Handle, Task, TimerHandle, get_running_loop
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+from ._scope import BindHandler, ScopePool
+from .errors import BatchSizeMismatchError
+from .Interface import IContext
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class BatchPolicy:
+    """
+    max_size: a batch is flushed as soon as it holds `max_size` messages
+    window: seconds to wait for more messages after the first one arrives,
+    0 flushes on the next loop iteration, coalescing messages sent concurrently.
+    """
+
+    max_size: int = 100
+    window: float = 0
+
+
+class MessageBatcher:
+    """
+    Coalesce concurrent sends into one call of a handler that receives a list of messages,
+    the handler must return a sequence of results in the same order.
+
+    a batch is handled in a message scope of its own, where the handler is bound,
+    so that it does not depend on the send that opened it, which might be cancelled meanwhile.
+    it receives the context of that send.
+    """
+
+    def __init__(self, policy: BatchPolicy, *, bind: BindHandler, scopes: ScopePool):
+        self._policy = policy
+        self._bind = bind
+        self._scopes = scopes
+        self._pending: list[tuple[Any, Future[Any]]] = []
+        self._context: IContext | None = None
+        self._timer: Handle | TimerHandle | None = None
+        self._tasks: set[Task[None]] = set()
+
+    @property
+    def policy(self) -> BatchPolicy:
+        return self._policy
+
+    async def submit(self, message: Any, context: IContext) -> Any:
+        loop = get_running_loop()
+        future: Future[Any] = loop.create_future()
+
+        if not self._pending:
+            self._context = context
+            if self._policy.window > 0:
+                self._timer = loop.call_later(self._policy.window, self._flush)
+            else:
+                self._timer = loop.call_soon(self._flush)
+
+        self._pending.append((message, future))
+        if len(self._pending) >= self._policy.max_size:
+            self._flush()
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+        task = get_running_loop().create_task(
+            self._handle(self._context, batch)  # type: ignore
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _handle(
+        self, context: IContext, batch: list[tuple[Any, Future[Any]]]
+    ) -> None:
+        try:
+            async with self._scopes.scope() as scope:
+                handler = await self._bind(scope)
+                results: Sequence[Any] = await handler(
+                    [msg for msg, _ in batch], context
+                )
+            if len(results) != len(batch):
+                raise BatchSizeMismatchError(handler, len(batch), len(results))
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,98 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any, Callable, Hashable
+
+from .Interface import IContext
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class CachePolicy:
+    """
+    maxsize: max number of cached results, least recently used ones are evicted first
+    ttl: seconds a result stays valid, None for no expiry
+    evict_on: event types, publishing any of them (or their subclasses) clears the cache
+    """
+
+    maxsize: int = 1024
+    ttl: float | None = None
+    evict_on: tuple[type, ...] = ()
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class CacheStats:
+    hits: int
+    misses: int
+    size: int
+    maxsize: int
+
+
+class ResultCache:
+    """
+    A LRU cache of handler results keyed by message,
+    messages must be hashable, unhashable messages are never cached.
+    """
+
+    def __init__(self, policy: CachePolicy):
+        self._policy = policy
+        self._results: OrderedDict[Hashable, tuple[float | None, Any]] = OrderedDict()
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def policy(self) -> CachePolicy:
+        return self._policy
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            size=len(self._results),
+            maxsize=self._policy.maxsize,
+        )
+
+    def clear(self) -> None:
+        self._results.clear()
+        # results of executions that started before clear must not be stored
+        self._generation += 1
+
+    def _get(self, message: Hashable) -> tuple[bool, Any]:
+        try:
+            expires_at, result = self._results[message]
+        except KeyError:
+            return False, None
+
+        if expires_at is not None and expires_at <= monotonic():
+            del self._results[message]
+            return False, None
+
+        self._results.move_to_end(message)
+        return True, result
+
+    def _set(self, message: Hashable, result: Any) -> None:
+        ttl = self._policy.ttl
+        self._results[message] = (None if ttl is None else monotonic() + ttl, result)
+        self._results.move_to_end(message)
+        if len(self._results) > self._policy.maxsize:
+            self._results.popitem(last=False)
+
+    async def call(
+        self, handler: Callable[..., Any], message: Any, context: IContext
+    ) -> Any:
+        try:
+            hit, result = self._get(message)
+        except TypeError:
+            return await handler(message, context)
+
+        if hit:
+            self._hits += 1
+            return result
+
+        self._misses += 1
+        generation = self._generation
+        result = await handler(message, context)
+        if generation == self._generation:
+            self._set(message, result)
+        return result
@@ -0,0 +1,78 @@
+from asyncio import TimerHandle, get_running_loop
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Any, Callable, Hashable
+
+from .Interface import IEventContext
+
+type Dispatch = Callable[[Any, IEventContext | None], None]
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class CoalescePolicy:
+    """
+    window: seconds between the first event of a key and the dispatch,
+    events of the same key published meanwhile are coalesced into one
+    key: extracts the coalescing key of an event, `event.entity_id` by default
+    merge: combines the pending event with a newer one, None keeps the newer one
+    """
+
+    window: float = 0.1
+    key: Callable[[Any], Hashable] = attrgetter("entity_id")
+    merge: Callable[[Any, Any], Any] | None = None
+
+
+class EventCoalescer:
+    """
+    Hold events per (event type, key) for a window, then dispatch only the latest,
+    or merged, one, so listeners of high-frequency events run once per window.
+
+    the window starts with the first event of a key and is not extended by later ones,
+    an event is never delayed for more than `window` seconds.
+    """
+
+    def __init__(self, policy: CoalescePolicy):
+        self._policy = policy
+        self._pending: dict[
+            Hashable, tuple[Any, IEventContext | None, Dispatch, TimerHandle]
+        ] = {}
+        self._coalesced = 0
+
+    @property
+    def policy(self) -> CoalescePolicy:
+        return self._policy
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    @property
+    def coalesced(self) -> int:
+        "events merged into, or replaced by, another one"
+        return self._coalesced
+
+    def submit(
+        self, dispatch: Dispatch, event: Any, context: IEventContext | None
+    ) -> None:
+        key: tuple[type[Any], Hashable] = (event.__class__, self._policy.key(event))
+
+        if pending := self._pending.get(key):
+            previous, _, _, timer = pending
+            if self._policy.merge:
+                event = self._policy.merge(previous, event)
+            self._pending[key] = (event, context, dispatch, timer)
+            self._coalesced += 1
+            return
+
+        timer = get_running_loop().call_later(self._policy.window, self._flush, key)
+        self._pending[key] = (event, context, dispatch, timer)
+
+    def _flush(self, key: Hashable) -> None:
+        event, context, dispatch, _ = self._pending.pop(key)
+        dispatch(event, context)
+
+    def flush(self) -> None:
+        "dispatch every pending event now, e.g. on shutdown"
+        for key in list(self._pending):
+            self._pending[key][3].cancel()
+            self._flush(key)
@@ -0,0 +1,74 @@
+from types import MappingProxyType
+from typing import Any, ClassVar, Iterator, Mapping, MutableMapping
+
+EMPTY_CONTEXT: Mapping[Any, Any] = MappingProxyType({})
+"the read-only context shared by every event published without one, and by commands whose handler and guards take no context"
+
+
+class SlotContext(MutableMapping[str, Any]):
+    """
+    Base class of a fixed-layout context, fields are declared as `__slots__`,
+    and can be accessed both as attributes and as keys, so guards written against a dict still work.
+    unset fields are missing keys, keys that are not fields can't be set.
+
+    ```py
+    class RequestContext(SlotContext):
+        __slots__ = ("request_id", "ip")
+
+
+    async def create_user(cmd: CreateUser, ctx: Context[RequestContext]):
+        logger.info(f"{ctx.request_id} from {ctx.ip}")
+
+
+    await aw.send(CreateUser(...), context=RequestContext(ip="127.0.0.1"))
+    ```
+    """
+
+    __slots__ = ()
+
+    _fields: ClassVar[tuple[str, ...]] = ()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        fields: list[str] = []
+        for base in reversed(cls.__mro__):
+            slots = base.__dict__.get("__slots__", ())
+            for name in (slots,) if isinstance(slots, str) else slots:
+                if name not in ("__dict__", "__weakref__") and name not in fields:
+                    fields.append(name)
+        cls._fields = tuple(fields)
+
+    def __init__(self, **fields: Any):
+        for name, value in fields.items():
+            self[name] = value
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={value!r}" for name, value in self.items())
+        return f"{self.__class__.__name__}({fields})"
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._fields:
+            raise KeyError(key)
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self._fields:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self._fields:
+            raise KeyError(key)
+        try:
+            delattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return (name for name in self._fields if hasattr(self, name))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
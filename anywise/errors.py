@@ -43,3 +43,20 @@ class DunglingGuardError(AnyWiseError):
 class SinkUnsetError(AnyWiseError):
     def __init__(self):
         super().__init__("Sink is not set")
+
+
+class ExecutorNotFoundError(AnyWiseError):
+    def __init__(self, name: str | None):
+        super().__init__(f"Executor {name!r} is not configured")
+
+
+class BatchSizeMismatchError(AnyWiseError):
+    def __init__(self, handler: Any, expected: int, received: int):
+        super().__init__(
+            f"{handler} received {expected} messages but returned {received} results"
+        )
+
+
+class RuntimeClosedError(AnyWiseError):
+    def __init__(self):
+        super().__init__("Runtime is shut down, no more background tasks are accepted")
@@ -0,0 +1,196 @@
+import os
+from asyncio import get_running_loop, wrap_future
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextvars import copy_context
+from dataclasses import dataclass
+from functools import partial
+from multiprocessing import get_context
+from multiprocessing.context import BaseContext
+from threading import Lock
+from typing import Any, Callable, Mapping
+
+from .errors import ExecutorNotFoundError
+
+DEFAULT_EXECUTOR = "default"
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class ExecutorStats:
+    """
+    pending: tasks submitted but not yet picked up by a worker, i.e. queue depth
+    running: tasks being executed by a worker
+    """
+
+    name: str
+    max_workers: int | None
+    pending: int
+    running: int
+
+
+class ThreadExecutor:
+    """
+    A named thread pool that runs sync handlers,
+    unlike `asyncio.to_thread` it does not share the loop's default executor.
+    """
+
+    def __init__(self, name: str, max_workers: int | None = None):
+        self._name = name
+        self._max_workers = max_workers
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"anywise-{name}"
+        )
+        self._lock = Lock()
+        self._pending = 0
+        self._running = 0
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(name={self._name!r}, max_workers={self._max_workers})"
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def stats(self) -> ExecutorStats:
+        return ExecutorStats(
+            name=self._name,
+            max_workers=self._max_workers,
+            pending=self._pending,
+            running=self._running,
+        )
+
+    def _work[R](self, func: Callable[[], R]) -> R:
+        with self._lock:
+            self._pending -= 1
+            self._running += 1
+        try:
+            return func()
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def _on_done(self, future: Future[Any]) -> None:
+        if future.cancelled():
+            # never picked up by a worker
+            with self._lock:
+                self._pending -= 1
+
+    async def run[R](self, func: Callable[..., R], /, *args: Any, **kwargs: Any) -> R:
+        "run func in the pool, contextvars are propagated like `asyncio.to_thread`"
+        context = copy_context()
+        func_call: Callable[[], R] = lambda: context.run(func, *args, **kwargs)
+        with self._lock:
+            self._pending += 1
+        future: Future[R] = self._pool.submit(self._work, func_call)
+        future.add_done_callback(self._on_done)
+        return await wrap_future(future)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+
+class ProcessExecutor:
+    """
+    A process pool for cpu-bound sync handlers that would otherwise hold the GIL.
+
+    the handler is pickled by reference, so it must be importable (e.g. module level).
+    dependencies are resolved on the event loop, then the message, the dependencies
+    and the result are pickled across the boundary.
+
+    ```py
+    aw = Anywise(registry, executors={"cpu": ProcessExecutor(max_workers=4)})
+    registry.register(generate_report, executor="cpu")
+    ```
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        *,
+        name: str = "process",
+        mp_context: BaseContext | None = None,
+    ):
+        self._name = name
+        self._max_workers = max_workers or os.cpu_count() or 1
+        # fork is unsafe once the event loop and executor threads are running
+        self._pool = ProcessPoolExecutor(
+            max_workers=self._max_workers,
+            mp_context=mp_context or get_context("spawn"),
+        )
+        self._in_flight = 0
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(name={self._name!r}, max_workers={self._max_workers})"
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def stats(self) -> ExecutorStats:
+        "running is estimated from tasks in flight, the pool does not report it"
+        running = min(self._in_flight, self._max_workers)
+        return ExecutorStats(
+            name=self._name,
+            max_workers=self._max_workers,
+            pending=self._in_flight - running,
+            running=running,
+        )
+
+    async def run[R](self, func: Callable[..., R], /, *args: Any, **kwargs: Any) -> R:
+        loop = get_running_loop()
+        self._in_flight += 1
+        try:
+            return await loop.run_in_executor(
+                self._pool, partial(func, *args, **kwargs)
+            )
+        finally:
+            self._in_flight -= 1
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+
+type IExecutor = ThreadExecutor | ProcessExecutor
+
+
+class Executors:
+    """
+    Named executors owned by an `Anywise` instance,
+    a `default` thread executor always exists.
+
+    config maps an executor name to either max workers of a thread executor,
+    or an executor instance.
+
+    ```py
+    aw = Anywise(
+        registry,
+        executors={"default": 16, "db": 4, "cpu": ProcessExecutor(max_workers=4)},
+    )
+    ```
+    """
+
+    def __init__(self, config: Mapping[str, int | None | IExecutor] | None = None):
+        config = dict(config or {})
+        config.setdefault(DEFAULT_EXECUTOR, None)
+        self._executors: dict[str, IExecutor] = {
+            name: (
+                ThreadExecutor(name, value)
+                if value is None or isinstance(value, int)
+                else value
+            )
+            for name, value in config.items()
+        }
+
+    def __getitem__(self, name: str | None) -> IExecutor:
+        try:
+            return self._executors[name or DEFAULT_EXECUTOR]
+        except KeyError:
+            raise ExecutorNotFoundError(name)
+
+    def stats(self) -> dict[str, ExecutorStats]:
+        return {name: executor.stats for name, executor in self._executors.items()}
+
+    def shutdown(self, wait: bool = True) -> None:
+        for executor in self._executors.values():
+            executor.shutdown(wait=wait)
@@ -1,8 +1,9 @@
 from abc import ABC
-from typing import Any
+from contextvars import ContextVar
+from typing import Any, Sequence
 
 from .errors import DunglingGuardError
-from .Interface import GuardFunc, IContext, PostHandle
+from .Interface import GuardFunc, IContext, IGuard, PostHandle
 
 """
 class AuthContext(TypedDict):
@@ -146,3 +147,59 @@ class Guard(BaseGuard):
         if self.post_handle:
             return await self.post_handle(command, context, response)
         return response
+
+
+class NextGuard:
+    """
+    The next guard of every guard in a `GuardChain`,
+    forwards to whatever follows that guard in the chain being run.
+    """
+
+    __slots__ = ("_guard",)
+
+    def __init__(self, guard: IGuard):
+        self._guard = guard
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self._guard.__class__.__name__})"
+
+    async def __call__(self, command: Any, context: IContext) -> Any:
+        try:
+            chain, handler = _running_chain.get()
+        except LookupError:
+            raise DunglingGuardError(self._guard)
+        return await chain.next_of(self._guard, handler)(command, context)
+
+
+class GuardChain:
+    """
+    Guards linked in order, ending with the handler passed on each call.
+
+    guards are linked as they are, never copied, a guard instance shared among
+    message types, e.g. a global or a singleton guard, keeps its state across sends.
+    """
+
+    __slots__ = ("_guards", "_positions")
+
+    def __init__(self, guards: Sequence[IGuard]):
+        self._guards = tuple(guards)
+        self._positions = {id(guard): pos for pos, guard in enumerate(self._guards)}
+        for guard in self._guards:
+            if not isinstance(guard.next_guard, NextGuard):
+                guard.chain_next(NextGuard(guard))
+
+    def next_of(self, guard: IGuard, handler: GuardFunc) -> GuardFunc:
+        pos = self._positions[id(guard)] + 1
+        return self._guards[pos] if pos < len(self._guards) else handler
+
+    async def __call__(self, handler: GuardFunc, command: Any, context: IContext):
+        token = _running_chain.set((self, handler))
+        try:
+            return await self._guards[0](command, context)
+        finally:
+            _running_chain.reset(token)
+
+
+_running_chain: ContextVar[tuple[GuardChain, GuardFunc]] = ContextVar(
+    "anywise_guard_chain"
+)
@@ -1,8 +1,8 @@
 from collections import defaultdict
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Sequence
 
 from sqlalchemy import insert, select
-from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
 
 from .model import IEvent
 from .table import EventTable, event_to_mapping, mapping_to_event
@@ -17,6 +17,24 @@ class EventStore:
         async with self._engine.begin() as conn:
             await conn.execute(stmt)
 
+    async def add_many(
+        self, events: Sequence[IEvent], conn: AsyncConnection | None = None
+    ):
+        """
+        insert `events` with a single executemany in one transaction,
+        pass `conn` to take part in the caller's transaction instead.
+        """
+        if not events:
+            return
+
+        rows = [event_to_mapping(event) for event in events]
+        if conn is not None:
+            await conn.execute(insert(EventTable), rows)
+            return
+
+        async with self._engine.begin() as conn:
+            await conn.execute(insert(EventTable), rows)
+
     async def list_events(self, entity_id: str) -> list[IEvent]:
         stmt = select(EventTable).where(EventTable.entity_id == entity_id)
         async with self._engine.begin() as conn:
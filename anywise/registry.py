@@ -1,26 +1,52 @@
 import inspect
 from collections import defaultdict
+from collections.abc import Sequence
+from dataclasses import replace
 from functools import partial
-from typing import Any, Callable, Unpack, cast, overload
+from typing import (
+    Any,
+    Callable,
+    Hashable,
+    Unpack,
+    cast,
+    get_args,
+    get_origin,
+    overload,
+)
 
 from ididi import Graph, INode, INodeConfig
 from ididi.interfaces import TDecor
 
 from ._ds import FuncMeta, GuardMeta, HandlerMapping, ListenerMapping, MethodMeta
 from ._visitor import Target, gather_types
+from .batch import BatchPolicy
+from .cache import CachePolicy
+from .coalesce import CoalescePolicy
+from .retry import RetryPolicy
 from .errors import (
     HandlerRegisterFailError,
     InvalidHandlerError,
+    InvalidMessageTypeError,
     MessageHandlerNotFoundError,
     NotSupportedHandlerTypeError,
 )
 from .guard import BaseGuard, Guard, GuardFunc, PostHandle
-from .Interface import CTX_MARKER, MISSING, Context, FrozenContext, IGuard, Maybe
+from .Interface import (
+    CTX_MARKER,
+    MISSING,
+    Context,
+    FrozenContext,
+    GuardLifetime,
+    IGuard,
+    Maybe,
+    PublishStrategy,
+)
 
 type GuardMapping = defaultdict[type, list[GuardMeta]]
 
 
 IGNORE_TYPES = (Context, FrozenContext)
+BATCH_TYPES = (list, Sequence)
 
 
 def is_contextparam(param: list[inspect.Parameter]) -> bool:
@@ -37,7 +63,22 @@ def is_contextparam(param: list[inspect.Parameter]) -> bool:
     return CTX_MARKER in metas
 
 
-def get_funcmetas[C](msg_base: type[C], func: Callable[..., Any]) -> list[FuncMeta[C]]:
+def unwrap_batch(annotation: Any) -> tuple[Any, bool]:
+    "a handler that receives `list[GetUser]` handles `GetUser` in batches"
+    if get_origin(annotation) in BATCH_TYPES:
+        return get_args(annotation)[0], True
+    return annotation, False
+
+
+def get_funcmetas[
+    C
+](
+    msg_base: type[C],
+    func: Callable[..., Any],
+    *,
+    executor: str | None = None,
+    batch: BatchPolicy | None = None,
+) -> list[FuncMeta[C]]:
     params = inspect.Signature.from_callable(func).parameters.values()
     if not params:
         raise MessageHandlerNotFoundError(msg_base, func)
@@ -45,13 +86,15 @@ def get_funcmetas[C](msg_base: type[C], func: Callable[..., Any]) -> list[FuncMe
     msg, *rest = params
     is_async: bool = inspect.iscoroutinefunction(func)
     is_contexted: bool = is_contextparam(rest)
-    derived_msgtypes = gather_types(msg.annotation)
+    annotation, is_batched = unwrap_batch(msg.annotation)
+    derived_msgtypes = gather_types(annotation)
 
     for msg_type in derived_msgtypes:
         if not issubclass(msg_type, msg_base):
             raise InvalidHandlerError(msg_base, msg_type, func)
 
-    ignore = tuple(derived_msgtypes) + IGNORE_TYPES
+    ignore = (msg.name,) + tuple(derived_msgtypes) + IGNORE_TYPES
+    batch = (batch or BatchPolicy()) if is_batched else None
 
     metas = [
         FuncMeta[C](
@@ -60,13 +103,21 @@ def get_funcmetas[C](msg_base: type[C], func: Callable[..., Any]) -> list[FuncMe
             is_async=is_async,
             is_contexted=is_contexted,
             ignore=ignore,
+            executor=executor,
+            batch=batch,
         )
         for t in derived_msgtypes
     ]
     return metas
 
 
-def get_methodmetas(msg_base: type, cls: type) -> list[MethodMeta[Any]]:
+def get_methodmetas(
+    msg_base: type,
+    cls: type,
+    *,
+    executor: str | None = None,
+    batch: BatchPolicy | None = None,
+) -> list[MethodMeta[Any]]:
     cls_members = inspect.getmembers(cls, predicate=inspect.isfunction)
     method_metas: list[MethodMeta[Any]] = []
     for name, func in cls_members:
@@ -79,7 +130,8 @@ def get_methodmetas(msg_base: type, cls: type) -> list[MethodMeta[Any]]:
         _, msg, *rest = params  # ignore `self`
         is_async: bool = inspect.iscoroutinefunction(func)
         is_contexted: bool = is_contextparam(rest)
-        derived_msgtypes = gather_types(msg.annotation)
+        annotation, is_batched = unwrap_batch(msg.annotation)
+        derived_msgtypes = gather_types(annotation)
 
         if not all(issubclass(msg_type, msg_base) for msg_type in derived_msgtypes):
             continue
@@ -94,6 +146,8 @@ def get_methodmetas(msg_base: type, cls: type) -> list[MethodMeta[Any]]:
                 is_contexted=is_contexted,
                 ignore=ignore,  # type: ignore
                 owner_type=cls,
+                executor=executor,
+                batch=(batch or BatchPolicy()) if is_batched else None,
             )
             for t in derived_msgtypes
         ]
@@ -113,6 +167,7 @@ class MessageRegistry[C, E]:
         command_base: type[C],
         event_base: type[E] = type(MISSING),
         graph: Maybe[Graph] = MISSING,
+        executor: str | None = None,
     ) -> None: ...
 
     @overload
@@ -122,6 +177,7 @@ class MessageRegistry[C, E]:
         event_base: type[E],
         command_base: type[C] = type(MISSING),
         graph: Maybe[Graph] = MISSING,
+        executor: str | None = None,
     ) -> None: ...
 
     def __init__(
@@ -130,14 +186,24 @@ class MessageRegistry[C, E]:
         command_base: Maybe[type[C]] = MISSING,
         event_base: Maybe[type[E]] = MISSING,
         graph: Maybe[Graph] = MISSING,
+        executor: str | None = None,
     ):
+        """
+        executor: name of the executor that runs sync handlers of this registry,
+        configured via `Anywise(executors=...)`, None for the default executor.
+        """
         self._command_base = command_base
         self._event_base = event_base
         self._graph = graph or Graph()
+        self._executor = executor
 
         self.command_mapping: HandlerMapping[Any] = {}
         self.event_mapping: ListenerMapping[Any] = {}
         self.guard_mapping: GuardMapping = defaultdict(list)
+        self.single_flight_types: set[type] = set()
+        self.cache_policies: dict[type, CachePolicy] = {}
+        self.publishers: dict[type, PublishStrategy[Any]] = {}
+        self.coalesce_policies: dict[type, CoalescePolicy] = {}
 
     @property
     def graph(self) -> Graph:
@@ -151,6 +217,10 @@ class MessageRegistry[C, E]:
     def event_base(self) -> Maybe[type[E]]:
         return self._event_base
 
+    @property
+    def executor(self) -> str | None:
+        return self._executor
+
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(command_base={self._command_base}, event_base={self._event_base})"
 
@@ -184,31 +254,54 @@ class MessageRegistry[C, E]:
         self._graph.node(**config)(factory)
         return factory
 
-    def _register_commandhanlders(self, handler: Target) -> None:
+    def _register_commandhanlders(
+        self,
+        handler: Target,
+        executor: str | None = None,
+        batch: BatchPolicy | None = None,
+    ) -> None:
         if not self._command_base:
             return
 
+        executor = executor or self._executor
         if inspect.isfunction(handler):
-            metas = get_funcmetas(self._command_base, handler)
+            metas = get_funcmetas(
+                self._command_base, handler, executor=executor, batch=batch
+            )
         elif inspect.isclass(handler):
-            metas = get_methodmetas(self._command_base, handler)
+            metas = get_methodmetas(
+                self._command_base, handler, executor=executor, batch=batch
+            )
         else:
             raise NotSupportedHandlerTypeError(handler)
 
         mapping = {meta.message_type: meta for meta in metas}
         self.command_mapping.update(mapping)
 
-    def _register_eventlisteners(self, listener: Target) -> None:
+    def _register_eventlisteners(
+        self,
+        listener: Target,
+        executor: str | None = None,
+        retry: RetryPolicy | None = None,
+    ) -> None:
         if not self._event_base:
             return
 
+        executor = executor or self._executor
         if inspect.isfunction(listener):
-            metas = get_funcmetas(self._event_base, listener)
+            metas = get_funcmetas(self._event_base, listener, executor=executor)
         elif inspect.isclass(listener):
-            metas = get_methodmetas(self._event_base, listener)
+            metas = get_methodmetas(self._event_base, listener, executor=executor)
         else:
             raise NotSupportedHandlerTypeError(listener)
 
+        if any(meta.batch for meta in metas):
+            # listeners do not return results, there is nothing to batch
+            raise InvalidMessageTypeError(list)
+
+        if retry:
+            metas = [replace(meta, retry=retry) for meta in metas]
+
         for meta in metas:
             msg_type = meta.message_type
             if msg_type not in self.event_mapping:
@@ -217,20 +310,42 @@ class MessageRegistry[C, E]:
                 self.event_mapping[msg_type].append(meta)
 
     @overload
-    def _register[T](self, handler: type[T]) -> type[T]: ...
+    def _register[
+        T
+    ](
+        self,
+        handler: type[T],
+        executor: str | None = None,
+        batch: BatchPolicy | None = None,
+        retry: RetryPolicy | None = None,
+    ) -> type[T]: ...
 
     @overload
-    def _register[**P, R](self, handler: Callable[P, R]) -> Callable[P, R]: ...
+    def _register[
+        **P, R
+    ](
+        self,
+        handler: Callable[P, R],
+        executor: str | None = None,
+        batch: BatchPolicy | None = None,
+        retry: RetryPolicy | None = None,
+    ) -> Callable[P, R]: ...
 
-    def _register(self, handler: Target):
+    def _register(
+        self,
+        handler: Target,
+        executor: str | None = None,
+        batch: BatchPolicy | None = None,
+        retry: RetryPolicy | None = None,
+    ):
         try:
-            self._register_commandhanlders(handler)
+            self._register_commandhanlders(handler, executor, batch)
         except HandlerRegisterFailError:
-            self._register_eventlisteners(handler)
+            self._register_eventlisteners(handler, executor, retry)
             return handler
 
         try:
-            self._register_eventlisteners(handler)
+            self._register_eventlisteners(handler, executor, retry)
         except HandlerRegisterFailError:
             pass
         return handler
@@ -240,13 +355,26 @@ class MessageRegistry[C, E]:
         *handlers: Callable[..., Any] | type[BaseGuard],
         pre_hanldes: list[GuardFunc] | None = None,
         post_handles: list[PostHandle[Any]] | None = None,
+        executor: str | None = None,
+        batch: BatchPolicy | None = None,
+        retry: RetryPolicy | None = None,
     ) -> None:
+        """
+        executor: name of the executor that runs the sync handlers registered here,
+        overrides the executor of the registry.
+
+        batch: batching policy of handlers that receive a list of messages,
+        e.g. `async def get_users(queries: list[GetUser]) -> list[User]`
+
+        retry: retry policy of the listeners registered here, a failed delivery
+        is retried in the background then sunk to `Anywise(dead_letter=...)`.
+        """
         for handler in handlers:
             if inspect.isclass(handler):
                 if issubclass(handler, BaseGuard):
                     self.add_guards(handler)
                     continue
-            self._register(handler)
+            self._register(handler, executor, batch, retry)
 
         if pre_hanldes:
             for pre_handle in pre_hanldes:
@@ -256,11 +384,85 @@ class MessageRegistry[C, E]:
             for post_handle in post_handles:
                 self.post_handle(post_handle)
 
+    def single_flight(self, *msg_types: type) -> None:
+        """
+        concurrent sends of equal messages of `msg_types`, or their subclasses,
+        share one handler execution, messages must be hashable.
+
+        ```py
+        registry.single_flight(ListTodos, GetTodo)
+        ```
+        """
+        self.single_flight_types.update(msg_types)
+
+    def cache(
+        self,
+        *msg_types: type,
+        maxsize: int = 1024,
+        ttl: float | None = None,
+        evict_on: Sequence[type] = (),
+    ) -> None:
+        """
+        cache handler results of `msg_types`, or their subclasses, keyed by message.
+        messages must be hashable.
+
+        ```py
+        registry.cache(ListTodos, ttl=60, evict_on=[TodoCreated, TodoRetitled])
+        ```
+        """
+        policy = CachePolicy(maxsize=maxsize, ttl=ttl, evict_on=tuple(evict_on))
+        for msg_type in msg_types:
+            self.cache_policies[msg_type] = policy
+
+    def publish_strategy(
+        self, *event_types: type, publisher: PublishStrategy[Any]
+    ) -> None:
+        """
+        publish events of `event_types`, or their subclasses, with `publisher`
+        instead of the publisher of `Anywise`.
+
+        ```py
+        registry.publish_strategy(
+            UserCreated, publisher=bounded_publish(max_concurrency=4, listener_timeout=1)
+        )
+        ```
+        """
+        for event_type in event_types:
+            self.publishers[event_type] = publisher
+
+    def coalesce(
+        self,
+        *event_types: type,
+        window: float = 0.1,
+        key: Callable[[Any], Hashable] | None = None,
+        merge: Callable[[Any, Any], Any] | None = None,
+    ) -> None:
+        """
+        coalesce events of `event_types`, or their subclasses, published within `window` seconds
+        for the same key, listeners receive only the latest one, or the result of `merge`.
+        `publish` returns once the event is held, listeners run after the window.
+
+        ```py
+        registry.coalesce(ProgressUpdated, window=0.5)
+        registry.coalesce(
+            CounterIncreased,
+            key=lambda e: e.counter_id,
+            merge=lambda old, new: CounterIncreased(new.counter_id, old.by + new.by),
+        )
+        ```
+        """
+        policy = CoalescePolicy(window=window, merge=merge)
+        if key:
+            policy = replace(policy, key=key)
+        for event_type in event_types:
+            self.coalesce_policies[event_type] = policy
+
     def get_guardtarget(self, func: Callable[..., Any]) -> set[type]:
 
         if inspect.isclass(func):
             func_params = list(inspect.signature(func.__call__).parameters.values())[1:]
-        elif inspect.isfunction(func):
+        elif callable(func):
+            # functions and guard instances, `self` is already bound for the latter
             func_params = list(inspect.signature(func).parameters.values())
         else:
             raise MessageHandlerNotFoundError(self._command_base, func)
@@ -274,21 +476,41 @@ class MessageRegistry[C, E]:
 
     def pre_handle(self, func: GuardFunc) -> GuardFunc:
         targets = self.get_guardtarget(func)
+        guard = Guard(pre_handle=func)
         for target in targets:
-            meta = GuardMeta(guard_target=target, guard=Guard(pre_handle=func))
+            meta = GuardMeta(guard_target=target, guard=guard)
             self.guard_mapping[target].append(meta)
         return func
 
     def post_handle[R](self, func: PostHandle[R]) -> PostHandle[R]:
         targets = self.get_guardtarget(func)
+        guard = Guard(post_handle=func)
         for target in targets:
-            meta = GuardMeta(guard_target=target, guard=Guard(post_handle=func))
+            meta = GuardMeta(guard_target=target, guard=guard)
             self.guard_mapping[target].append(meta)
         return func
 
-    def add_guards(self, *guards: IGuard | type[IGuard]) -> None:
+    def add_guards(
+        self, *guards: IGuard | type[IGuard], lifetime: GuardLifetime = "scope"
+    ) -> None:
+        """
+        lifetime: how often a class-based guard is resolved, ignored for guard instances.
+
+        - `singleton`: once at `Anywise.include`, then reused by every send,
+        it must not depend on scoped resources.
+        - `scope`: once per message scope.
+        - `call`: on every send.
+
+        ```py
+        registry.add_guards(IPLimiter, lifetime="singleton")
+        ```
+        """
         for guard in guards:
+            if isinstance(guard, type) and lifetime != "singleton":
+                # otherwise the graph would reuse the first instance across scopes
+                self._graph.node(guard, reuse=False)
+
             targets = self.get_guardtarget(guard)
             for target in targets:
-                meta = GuardMeta(guard_target=target, guard=guard)
+                meta = GuardMeta(guard_target=target, guard=guard, lifetime=lifetime)
                 self.guard_mapping[target].append(meta)
@@ -0,0 +1,102 @@
+from asyncio import sleep
+from dataclasses import dataclass
+from random import uniform
+from typing import Any, Awaitable, Callable
+
+from ididi import AsyncScope
+
+from ._scope import ScopePool
+from .runtime import Runtime
+from .sink import IEventSink
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class RetryPolicy:
+    """
+    max_attempts: deliveries in total, including the first one
+    base_delay: seconds to wait before the first retry, doubled for every retry after
+    max_delay: upper bound of the delay between two deliveries
+    jitter: wait a random time between 0 and the delay, so failed listeners don't retry in lockstep
+    """
+
+    max_attempts: int = 3
+    base_delay: float = 0.1
+    max_delay: float = 30
+    jitter: bool = True
+
+    def backoff(self, retry: int) -> float:
+        "seconds to wait before the `retry`-th retry, starting from 1"
+        delay = min(self.max_delay, self.base_delay * 2 ** (retry - 1))
+        return uniform(0, delay) if self.jitter else delay
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class DeadLetter:
+    "an event a listener failed to handle after every attempt"
+
+    event: Any
+    listener: str
+    error: Exception
+    attempts: int
+
+
+class Redelivery:
+    """
+    Retries failed listener deliveries in the background,
+    so the publisher is not blocked for the backoff.
+
+    each retry runs in a message scope of its own,
+    a delivery that still fails after `max_attempts` is sunk to `dead_letter` as a `DeadLetter`,
+    or reported to the runtime if no dead letter sink is set.
+    """
+
+    def __init__(
+        self,
+        runtime: Runtime,
+        scopes: ScopePool,
+        dead_letter: IEventSink[DeadLetter] | None = None,
+    ):
+        self._runtime = runtime
+        self._scopes = scopes
+        self._dead_letter = dead_letter
+
+    def schedule(
+        self,
+        deliver: Callable[[AsyncScope], Awaitable[Any]],
+        policy: RetryPolicy,
+        *,
+        event: Any,
+        listener: str,
+        error: Exception,
+    ) -> None:
+        self._runtime.spawn(
+            self._retry(deliver, policy, event, listener, error), message=event
+        )
+
+    async def _retry(
+        self,
+        deliver: Callable[[AsyncScope], Awaitable[Any]],
+        policy: RetryPolicy,
+        event: Any,
+        listener: str,
+        error: Exception,
+    ) -> None:
+        for retry in range(1, policy.max_attempts):
+            await sleep(policy.backoff(retry))
+            try:
+                async with self._scopes.scope() as scope:
+                    await deliver(scope)
+                return
+            except Exception as exc:
+                error = exc
+
+        if self._dead_letter is None:
+            raise error
+
+        dead = DeadLetter(
+            event=event,
+            listener=listener,
+            error=error,
+            attempts=policy.max_attempts,
+        )
+        await self._dead_letter.sink(dead)
@@ -1,38 +1,109 @@
-# # from asyncio import TaskGroup
-# from contextvars import ContextVar, Token
-# from typing import ClassVar
+from asyncio import Semaphore, Task, gather, get_running_loop, wait
+from dataclasses import dataclass
+from inspect import isawaitable
+from typing import Any, Awaitable, Callable, Coroutine
 
-# # from anyio import create_task_group
-# from anyio.abc import TaskGroup
-# from ididi import AsyncScope
+from .errors import RuntimeClosedError
 
+type FailureHook = Callable[[Any, Exception], Awaitable[None] | None]
+"called with the message and the exception of a failed background task"
 
-# class Runtime:
-#     _task_ctx: ClassVar[ContextVar[TaskGroup]]
-#     _scope_ctx: ClassVar[ContextVar[AsyncScope]]
 
-#     _ctx_token_task: Token[TaskGroup]
-#     _ctx_token_scope: Token[AsyncScope]
+@dataclass(frozen=True, slots=True, kw_only=True)
+class RuntimeStats:
+    """
+    pending: tasks waiting for a free slot
+    running: tasks being executed
+    failed: tasks that raised since the runtime was created
+    """
 
-#     # async __aexit__(self): self._task_ctx.reset(self._ctx_token_task)
+    pending: int
+    running: int
+    failed: int
 
-#     async def add_task(self, task):
-#         """
-#         scheduling a background task
 
-#         tg = self._task_ctx.get()
-#         tg.start_soon(task)
+class Runtime:
+    """
+    Supervises background tasks, e.g. `Anywise.publish(event, background=True)`.
 
-#         """
+    - at most `max_concurrency` tasks run at the same time, the rest wait for a slot.
+    - a failed task never affects the others, its exception is passed to `on_error`,
+    or to the event loop's exception handler if no hook is set.
+    - `shutdown` stops accepting tasks and waits for scheduled ones to finish.
+    """
 
-#     async def gather_tasks(self):
-#         """
-#         in starlette
+    def __init__(
+        self, *, max_concurrency: int = 100, on_error: FailureHook | None = None
+    ):
+        self._slots = Semaphore(max_concurrency)
+        self._on_error = on_error
+        self._tasks: set[Task[None]] = set()
+        self._running = 0
+        self._failed = 0
+        self._closed = False
 
-#         tasks = BackgroundTasks()
-#         tasks.add_task(anywise.gather_tasks)
+    @property
+    def stats(self) -> RuntimeStats:
+        return RuntimeStats(
+            pending=len(self._tasks) - self._running,
+            running=self._running,
+            failed=self._failed,
+        )
 
-#         """
-#         # tg = self._task_ctx.get()
-#         # await tg.__aexit__
-#         ...
+    def spawn(self, coro: Coroutine[Any, Any, Any], *, message: Any = None) -> None:
+        "schedule `coro` in the background, `message` is what `on_error` receives"
+        if self._closed:
+            coro.close()
+            raise RuntimeClosedError()
+
+        task = get_running_loop().create_task(self._supervise(coro, message))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _supervise(self, coro: Coroutine[Any, Any, Any], message: Any) -> None:
+        async with self._slots:
+            self._running += 1
+            try:
+                await coro
+            except Exception as exc:
+                self._failed += 1
+                await self._report(message, exc)
+            finally:
+                self._running -= 1
+
+    async def _report(self, message: Any, exc: Exception) -> None:
+        if self._on_error is None:
+            get_running_loop().call_exception_handler(
+                {
+                    "message": f"background task of {message} failed",
+                    "exception": exc,
+                }
+            )
+            return
+
+        try:
+            if isawaitable(result := self._on_error(message, exc)):
+                await result
+        except Exception as hook_exc:
+            get_running_loop().call_exception_handler(
+                {"message": "failure hook raised", "exception": hook_exc}
+            )
+
+    async def drain(self) -> None:
+        "wait until every scheduled task, including those scheduled meanwhile, is done"
+        while self._tasks:
+            await wait(list(self._tasks))
+
+    async def shutdown(self, timeout: float | None = None) -> None:
+        """
+        stop accepting tasks and drain, tasks still running after `timeout`
+        seconds are cancelled.
+        """
+        self._closed = True
+        if not self._tasks:
+            return
+
+        _, not_done = await wait(list(self._tasks), timeout=timeout)
+        for task in not_done:
+            task.cancel()
+        await gather(*not_done, return_exceptions=True)
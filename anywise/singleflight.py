@@ -0,0 +1,51 @@
+from asyncio import Task, get_running_loop, shield
+from typing import Any, Callable, Hashable
+
+from ._scope import BindHandler, ScopePool
+from .Interface import IContext
+
+
+def _retrieve_exception(task: Task[Any]) -> None:
+    # every caller may have been cancelled, avoid "exception was never retrieved"
+    if not task.cancelled():
+        task.exception()
+
+
+class SingleFlight:
+    """
+    Let concurrent sends of equal messages share one in-flight execution,
+    a message is used as the key so it must be hashable, e.g. a frozen dataclass;
+    unhashable messages are handled without coalescing.
+
+    the execution runs in a task and a message scope of its own, where the handler is bound,
+    cancelling one caller neither cancels it nor tears down its resources for the others.
+    """
+
+    def __init__(self, *, bind: BindHandler, scopes: ScopePool):
+        self._bind = bind
+        self._scopes = scopes
+        self._in_flight: dict[Hashable, Task[Any]] = {}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    async def call(
+        self, handler: Callable[..., Any], message: Any, context: IContext
+    ) -> Any:
+        try:
+            task = self._in_flight.get(message)
+        except TypeError:
+            return await handler(message, context)
+
+        if task is None:
+            task = get_running_loop().create_task(self._run(message, context))
+            self._in_flight[message] = task
+            task.add_done_callback(_retrieve_exception)
+            task.add_done_callback(lambda _: self._in_flight.pop(message, None))
+        return await shield(task)
+
+    async def _run(self, message: Any, context: IContext) -> Any:
+        async with self._scopes.scope() as scope:
+            handler = await self._bind(scope)
+            return await handler(message, context)
@@ -1,5 +1,6 @@
-from asyncio.queues import Queue
-from typing import Protocol, Sequence
+from asyncio import Event, Lock, Task, TimerHandle, gather, get_running_loop
+from collections import deque
+from typing import Any, AsyncGenerator, Literal, Protocol, Sequence
 
 from ..messages import IEvent
 
@@ -30,10 +31,6 @@ from ..messages import IEvent
 #     "send event to kafka"
 
 
-# class DBSink(EventSink):
-#     "save events to database"
-
-
 class IEventSink[EventType](Protocol):
 
     async def sink(self, event: EventType | Sequence[EventType]):
@@ -45,17 +42,193 @@ class IEventSink[EventType](Protocol):
     #     ...
 
 
+type OverflowPolicy = Literal["block", "drop_oldest", "drop_newest"]
+
+
 class InMemorySink[EventType](IEventSink[EventType]):
-    def __init__(self, volume: int = 100):
-        self._queue = Queue[IEvent](volume)
+    """
+    A ring buffer holding up to `volume` events, consumers take them in batches.
+
+    overflow: what `sink` does when the buffer is full
+    - `block`: wait until a consumer makes room
+    - `drop_oldest`: evict the oldest event
+    - `drop_newest`: discard the incoming event
+
+    ```py
+    async for events in sink.batches(max_n=100):
+        await handle(events)
+    ```
+    """
+
+    def __init__(self, volume: int = 100, *, overflow: OverflowPolicy = "block"):
+        self._volume = volume
+        self._overflow = overflow
+        self._events: deque[EventType] = deque()
+        self._readable = Event()
+        self._writable = Event()
+        self._writable.set()
+        self._dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    @property
+    def dropped(self) -> int:
+        "events discarded by the overflow policy"
+        return self._dropped
+
+    async def sink(self, event: EventType | Sequence[EventType]):
+        events = event if isinstance(event, Sequence) else (event,)
+        for e in events:
+            if len(self._events) >= self._volume:
+                if self._overflow == "drop_newest":
+                    self._dropped += 1
+                    continue
+                if self._overflow == "drop_oldest":
+                    self._events.popleft()
+                    self._dropped += 1
+                else:
+                    while len(self._events) >= self._volume:
+                        self._writable.clear()
+                        await self._writable.wait()
+            self._events.append(e)
+            self._readable.set()
+
+    def drain(self, max_n: int | None = None) -> list[EventType]:
+        "take up to `max_n` buffered events, all of them if None, without waiting"
+        n = len(self._events) if max_n is None else min(max_n, len(self._events))
+        batch = [self._events.popleft() for _ in range(n)]
+
+        if not self._events:
+            self._readable.clear()
+        if len(self._events) < self._volume:
+            self._writable.set()
+        return batch
+
+    async def batches(self, max_n: int = 100) -> AsyncGenerator[list[EventType], None]:
+        "wait for events, then yield up to `max_n` of them at a time, forever"
+        while True:
+            await self._readable.wait()
+            if batch := self.drain(max_n):
+                yield batch
+
+
+def _report_flush_error(task: Task[Any]) -> None:
+    if not task.cancelled() and (exc := task.exception()):
+        get_running_loop().call_exception_handler(
+            {"message": "scheduled flush of BatchingSink failed", "exception": exc}
+        )
+
+
+class BatchingSink[EventType](IEventSink[EventType]):
+    """
+    Accumulate events and pass them to `sink` in batches,
+    a batch is flushed once it holds `max_size` events or `max_delay` seconds after its first event.
+    batches reach `sink` in the order they were flushed.
+
+    if `sink` raises, the batch is put back in front of the buffer and retried,
+    the delay before a scheduled retry doubles on every failure, up to `max_backoff`.
+    at most `max_pending` events are kept meanwhile, beyond it the `overflow` policy applies
+    - `drop_oldest`: evict the oldest events
+    - `drop_newest`: discard the incoming events
+
+    call `close` to flush what is left, `Anywise.shutdown` does it for the anywise sink.
+    a closed sink no longer schedules retries.
+
+    ```py
+    aw = Anywise(registry, sink=BatchingSink(DBSink(store), max_size=500, max_delay=0.05))
+    ```
+    """
+
+    def __init__(
+        self,
+        sink: IEventSink[EventType],
+        *,
+        max_size: int = 100,
+        max_delay: float = 0.05,
+        max_backoff: float = 30,
+        max_pending: int = 10_000,
+        overflow: Literal["drop_oldest", "drop_newest"] = "drop_oldest",
+    ):
+        self._sink = sink
+        self._max_size = max_size
+        self._max_delay = max_delay
+        self._max_backoff = max_backoff
+        self._max_pending = max_pending
+        self._overflow = overflow
+        self._buffer: list[EventType] = []
+        self._timer: TimerHandle | None = None
+        self._lock = Lock()
+        self._tasks: set[Task[None]] = set()
+        self._failures = 0
+        self._dropped = 0
+        self._closed = False
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
 
     @property
-    def queue(self):
-        return self._queue
+    def dropped(self) -> int:
+        "events discarded by the overflow policy"
+        return self._dropped
 
-    async def sink(self, event: IEvent | Sequence[IEvent]):
+    async def sink(self, event: EventType | Sequence[EventType]):
         if isinstance(event, Sequence):
-            for e in event:
-                await self._queue.put(e)
+            self._buffer.extend(event)
+        else:
+            self._buffer.append(event)
+        self._trim(newest=self._overflow == "drop_newest")
+
+        if len(self._buffer) >= self._max_size:
+            await self.flush()
+        elif self._timer is None:
+            self._schedule(self._max_delay)
+
+    def _trim(self, *, newest: bool) -> None:
+        "apply the overflow policy to events beyond `max_pending`"
+        if (excess := len(self._buffer) - self._max_pending) <= 0:
+            return
+        if newest:
+            del self._buffer[-excess:]
         else:
-            await self._queue.put(event)
+            del self._buffer[:excess]
+        self._dropped += excess
+
+    def _schedule(self, delay: float) -> None:
+        self._timer = get_running_loop().call_later(delay, self._schedule_flush)
+
+    def _schedule_flush(self) -> None:
+        self._timer = None
+        task = get_running_loop().create_task(self.flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        task.add_done_callback(_report_flush_error)
+
+    async def flush(self) -> None:
+        "pass buffered events to the inner sink now"
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+        async with self._lock:
+            if not self._buffer:
+                return
+            batch, self._buffer = self._buffer, []
+            try:
+                await self._sink.sink(batch)
+            except BaseException:
+                self._buffer[:0] = batch
+                # events that came in during the flush are the newest
+                self._trim(newest=self._overflow == "drop_newest")
+                self._failures += 1
+                if self._timer is None and not self._closed:
+                    backoff = self._max_delay * 2 ** min(self._failures, 32)
+                    self._schedule(min(backoff, self._max_backoff))
+                raise
+            self._failures = 0
+
+    async def close(self) -> None:
+        self._closed = True
+        await gather(*self._tasks, return_exceptions=True)
+        await self.flush()
@@ -0,0 +1,25 @@
+from typing import Sequence
+
+from ..messages import EventStore, IEvent
+from . import IEventSink
+
+
+class DBSink(IEventSink[IEvent]):
+    """
+    Save events to the database through `EventStore.add_many`,
+    every `sink` call is a single multi-row insert in one transaction.
+
+    wrap it in a `BatchingSink` to turn many small publishes into few inserts
+
+    ```py
+    sink = BatchingSink(DBSink(EventStore(engine)), max_size=500, max_delay=0.05)
+    aw = Anywise(registry, sink=sink)
+    ```
+    """
+
+    def __init__(self, store: EventStore):
+        self._store = store
+
+    async def sink(self, event: IEvent | Sequence[IEvent]):
+        events = event if isinstance(event, Sequence) else (event,)
+        await self._store.add_many(events)
@@ -0,0 +1,190 @@
+import os
+from asyncio import Lock
+from bisect import bisect_right
+from mmap import ACCESS_READ, mmap
+from pathlib import Path
+from struct import Struct
+from typing import BinaryIO, Callable, Iterator, Sequence
+
+from ..executor import ThreadExecutor
+from . import IEventSink
+from .spill import FRAME_HEADER, decode_event, encode_event
+
+INDEX_ENTRY = Struct(">Q")
+"an index entry is the position of a frame in its segment, 8-byte big-endian"
+
+
+def _segment_name(base: int) -> str:
+    return f"{base:020d}"
+
+
+def _fsync(files: Sequence[BinaryIO]) -> None:
+    for file in files:
+        os.fsync(file.fileno())
+
+
+class FileLogReader[EventType]:
+    """
+    Reads a log written by `FileSink`, from any offset.
+
+    segments are memory-mapped, `frames` yields each payload as a memoryview
+    into the map without copying. a frame is released when the next one is requested,
+    and the map is closed once its segment is done, use `bytes(frame)` to keep a payload.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        *,
+        decode: Callable[[bytes], EventType] = decode_event,  # type: ignore
+    ):
+        self._dir = Path(directory)
+        self._decode = decode
+
+    def segments(self) -> list[int]:
+        "base offsets of the segments, i.e. the offset of their first event, in order"
+        return sorted(int(path.stem) for path in self._dir.glob("*.log"))
+
+    def _position(self, base: int, nth: int) -> int | None:
+        with open(self._dir / f"{_segment_name(base)}.idx", "rb") as index:
+            index.seek(nth * INDEX_ENTRY.size)
+            if len(entry := index.read(INDEX_ENTRY.size)) < INDEX_ENTRY.size:
+                return None
+            return INDEX_ENTRY.unpack(entry)[0]
+
+    def frames(self, offset: int = 0) -> Iterator[memoryview]:
+        "yield the payload of every event from `offset` on"
+        bases = self.segments()
+        start = max(bisect_right(bases, offset) - 1, 0)
+
+        for base in bases[start:]:
+            position = self._position(base, max(offset - base, 0))
+            if position is None:
+                continue
+
+            with open(self._dir / f"{_segment_name(base)}.log", "rb") as log:
+                if os.fstat(log.fileno()).st_size == 0:
+                    continue
+                mapped = mmap(log.fileno(), 0, access=ACCESS_READ)
+
+            view = memoryview(mapped)
+            try:
+                while position < len(view):
+                    (size,) = FRAME_HEADER.unpack_from(view, position)
+                    position += FRAME_HEADER.size
+                    with view[position : position + size] as frame:
+                        yield frame
+                    position += size
+            finally:
+                view.release()
+                try:
+                    mapped.close()
+                except BufferError:
+                    # a view derived from a frame is still alive, gc closes the map later
+                    pass
+
+    def read(self, offset: int = 0) -> Iterator[EventType]:
+        "yield every event from `offset` on"
+        for frame in self.frames(offset):
+            yield self._decode(bytes(frame))
+
+
+class FileSink[EventType](IEventSink[EventType]):
+    """
+    An append-only, durable event log in `directory`.
+
+    events are numbered by offset, starting from 0, and written as length-prefixed frames
+    into segment files named by their first offset, a new segment is started once one
+    reaches `segment_bytes`. every segment has an index holding the position of each frame,
+    so that a reader starts from any offset without scanning.
+
+    writes are buffered and flushed at the end of every `sink` call,
+    `fsync=True` also forces them to disk, in a single thread owned by the sink.
+
+    ```py
+    sink = FileSink("/var/lib/app/events", segment_bytes=64 * 1024 * 1024)
+    aw = Anywise(registry, sink=sink)
+
+    for event in sink.reader().read(offset=1000):
+        ...
+    ```
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        *,
+        segment_bytes: int = 64 * 1024 * 1024,
+        encode: Callable[[EventType], bytes] = encode_event,  # type: ignore
+        decode: Callable[[bytes], EventType] = decode_event,  # type: ignore
+        fsync: bool = False,
+    ):
+        self._dir = Path(directory)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._segment_bytes = segment_bytes
+        self._encode = encode
+        self._decode = decode
+        self._fsync = fsync
+        self._lock = Lock()
+        # not the loop's default executor, a slow disk must not stall other `to_thread` users
+        self._executor = ThreadExecutor("filesink", max_workers=1) if fsync else None
+
+        bases = FileLogReader(self._dir).segments()
+        base = bases[-1] if bases else 0
+        self._open_segment(base)
+        index_size = os.fstat(self._index.fileno()).st_size
+        self._next_offset = base + index_size // INDEX_ENTRY.size
+
+    @property
+    def next_offset(self) -> int:
+        "offset of the next event to be written"
+        return self._next_offset
+
+    def _open_segment(self, base: int) -> None:
+        name = _segment_name(base)
+        self._log: BinaryIO = open(self._dir / f"{name}.log", "ab")
+        self._index: BinaryIO = open(self._dir / f"{name}.idx", "ab")
+        self._position = self._log.tell()
+
+    async def _close_segment(self) -> None:
+        await self._flush()
+        self._log.close()
+        self._index.close()
+
+    async def sink(self, event: EventType | Sequence[EventType]):
+        events = event if isinstance(event, Sequence) else (event,)
+        async with self._lock:
+            for e in events:
+                payload = self._encode(e)
+                self._log.write(FRAME_HEADER.pack(len(payload)))
+                self._log.write(payload)
+                self._index.write(INDEX_ENTRY.pack(self._position))
+                self._position += FRAME_HEADER.size + len(payload)
+                self._next_offset += 1
+
+                if self._position >= self._segment_bytes:
+                    await self._close_segment()
+                    self._open_segment(self._next_offset)
+
+            await self._flush()
+
+    async def _flush(self) -> None:
+        files = (self._log, self._index)
+        for file in files:
+            file.flush()
+        if self._executor:
+            await self._executor.run(_fsync, files)
+
+    async def flush(self) -> None:
+        "write buffered events to the os, and to disk with `fsync=True`"
+        async with self._lock:
+            await self._flush()
+
+    def reader(self) -> FileLogReader[EventType]:
+        return FileLogReader(self._dir, decode=self._decode)
+
+    async def close(self) -> None:
+        async with self._lock:
+            await self._close_segment()
+        if self._executor:
+            self._executor.shutdown()
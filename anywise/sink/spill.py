@@ -0,0 +1,121 @@
+import json
+from pathlib import Path
+from struct import Struct
+from typing import Callable, Sequence
+
+from ..messages import IEvent
+from ..messages.table import event_to_mapping, mapping_to_event
+from . import InMemorySink
+
+FRAME_HEADER = Struct(">I")
+"a frame is the payload size as a 4-byte big-endian unsigned int, then the payload"
+
+
+def encode_event(event: IEvent) -> bytes:
+    return json.dumps(event_to_mapping(event)).encode()
+
+
+def decode_event(data: bytes) -> IEvent:
+    return mapping_to_event(json.loads(data))
+
+
+class SpillingSink[EventType](InMemorySink[EventType]):
+    """
+    An `InMemorySink` that neither blocks nor drops,
+    events that do not fit in memory are appended to `path` as length-prefixed frames,
+    then read back, in order, as consumers drain the sink.
+
+    frames left in `path` by a previous instance are delivered first,
+    `close` writes events that were not drained back to `path`.
+    events are encoded as json of `IEvent.__normalized__` by default,
+    pass `encode` / `decode` to use another format, e.g. msgspec.
+
+    ```py
+    sink = SpillingSink("/var/lib/app/events.spill", volume=10_000)
+    ```
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        volume: int = 100,
+        *,
+        encode: Callable[[EventType], bytes] = encode_event,  # type: ignore
+        decode: Callable[[bytes], EventType] = decode_event,  # type: ignore
+    ):
+        super().__init__(volume)
+        self._encode = encode
+        self._decode = decode
+        # append mode, writes always go to the end while reads seek to `_read_at`
+        self._file = open(path, "a+b")
+        self._read_at = 0
+        self._spilled = self._count_frames()
+        if self._spilled:
+            self._refill()
+
+    def __len__(self) -> int:
+        return len(self._events) + self._spilled
+
+    @property
+    def spilled(self) -> int:
+        "events waiting on disk"
+        return self._spilled
+
+    def _count_frames(self) -> int:
+        count = 0
+        self._file.seek(0)
+        while header := self._file.read(FRAME_HEADER.size):
+            (size,) = FRAME_HEADER.unpack(header)
+            self._file.seek(size, 1)
+            count += 1
+        return count
+
+    async def sink(self, event: EventType | Sequence[EventType]):
+        events = event if isinstance(event, Sequence) else (event,)
+        spilled = self._spilled
+        for e in events:
+            # once anything is on disk, newer events go there too to keep the order
+            if self._spilled or len(self._events) >= self._volume:
+                payload = self._encode(e)
+                self._file.write(FRAME_HEADER.pack(len(payload)) + payload)
+                self._spilled += 1
+            else:
+                self._events.append(e)
+            self._readable.set()
+
+        if self._spilled != spilled:
+            self._file.flush()
+
+    def _refill(self) -> None:
+        self._file.seek(self._read_at)
+        while self._spilled and len(self._events) < self._volume:
+            (size,) = FRAME_HEADER.unpack(self._file.read(FRAME_HEADER.size))
+            self._events.append(self._decode(self._file.read(size)))
+            self._read_at += FRAME_HEADER.size + size
+            self._spilled -= 1
+
+        if not self._spilled:
+            self._file.truncate(0)
+            self._read_at = 0
+
+        if self._events:
+            self._readable.set()
+
+    def drain(self, max_n: int | None = None) -> list[EventType]:
+        batch = super().drain(max_n)
+        if self._spilled:
+            self._refill()
+        return batch
+
+    async def close(self) -> None:
+        "write events not drained yet to the spill file, so that the next instance delivers them"
+        if self._events:
+            self._file.seek(self._read_at)
+            rest = self._file.read()
+            self._file.truncate(0)
+            for e in self._events:
+                payload = self._encode(e)
+                self._file.write(FRAME_HEADER.pack(len(payload)) + payload)
+            self._file.write(rest)
+            self._events.clear()
+        self._file.close()
@@ -2,7 +2,7 @@
 - send_strategy: `Callable[[Any, MutableMapping[Any, Any], CommandHandler], Any]`
 
     ```py
-    async def sender(msg: Any, context: dict[Any, Any], handler: CommandHandler) -> Any:
+    async def sender(msg: Any, context: MutableMapping[Any, Any], handler: CommandHandler) -> Any:
         await handler(msg, context)
     ```
 
@@ -15,11 +15,18 @@
     ```
 """
 
-from asyncio import TaskGroup
-from types import MappingProxyType
+from asyncio import TaskGroup, timeout
 from typing import Any
 
-from .Interface import CommandHandler, EventListeners, IContext, IEventContext
+from .context import EMPTY_CONTEXT
+from .Interface import (
+    CommandHandler,
+    EventListener,
+    EventListeners,
+    IContext,
+    IEventContext,
+    PublishStrategy,
+)
 
 
 async def default_send[
@@ -35,7 +42,7 @@ async def default_publish[
     E
 ](message: E, context: IEventContext | None, listeners: EventListeners[E],) -> None:
     if context is None:
-        context = MappingProxyType({})
+        context = EMPTY_CONTEXT
 
     for listener in listeners:
         await listener(message, context)
@@ -44,8 +51,63 @@ async def default_publish[
 async def concurrent_publish[
     E
 ](msg: E, context: IEventContext | None, subscribers: EventListeners[E]) -> None:
-    if not context:
-        context = {}
+    if context is None:
+        context = EMPTY_CONTEXT
     async with TaskGroup() as tg:
         for sub in subscribers:
             tg.create_task(sub(msg, context))
+
+
+def bounded_publish(
+    *,
+    max_concurrency: int = 10,
+    fail_fast: bool = True,
+    listener_timeout: float | None = None,
+) -> PublishStrategy[Any]:
+    """
+    build a publish strategy that runs up to `max_concurrency` listeners at the same time.
+
+    fail_fast: if True, the first listener error cancels the rest and is raised,
+    otherwise every listener runs and errors are raised together as an `ExceptionGroup`.
+    listener_timeout: seconds a listener may take, a `TimeoutError` is raised for it otherwise.
+
+    ```py
+    aw = Anywise(registry, publisher=bounded_publish(max_concurrency=4, fail_fast=False))
+    ```
+    """
+
+    async def call(listener: EventListener[Any], msg: Any, context: IEventContext):
+        if listener_timeout is None:
+            return await listener(msg, context)
+        async with timeout(listener_timeout):
+            return await listener(msg, context)
+
+    async def publish[
+        E
+    ](msg: E, context: IEventContext | None, listeners: EventListeners[E]) -> None:
+        if context is None:
+            context = EMPTY_CONTEXT
+
+        errors: list[Exception] = []
+        pending = iter(listeners)
+
+        async def worker():
+            for listener in pending:
+                try:
+                    await call(listener, msg, context)
+                except Exception as exc:
+                    if fail_fast:
+                        raise
+                    errors.append(exc)
+
+        try:
+            async with TaskGroup() as tg:
+                for _ in range(min(max_concurrency, len(listeners))):
+                    tg.create_task(worker())
+        except ExceptionGroup as eg:
+            raise eg.exceptions[0]
+
+        if errors:
+            raise ExceptionGroup(f"listeners of {msg} failed", errors)
+
+    return publish
@@ -0,0 +1,62 @@
+"""
+Measure the overhead of `Anywise.send` over awaiting the handler directly.
+
+```bash
+uv run python -m benchmarks.send_overhead
+```
+"""
+
+import asyncio
+from dataclasses import dataclass
+from time import perf_counter
+
+from anywise import Anywise, Context, MessageRegistry
+
+ROUNDS = 100_000
+
+
+@dataclass
+class Command: ...
+
+
+@dataclass
+class Direct(Command): ...
+
+
+@dataclass
+class Contexted(Command): ...
+
+
+async def direct(cmd: Direct) -> None: ...
+
+
+async def contexted(cmd: Contexted, ctx: Context[dict[str, str]]) -> None: ...
+
+
+async def measure(label: str, call, msg: Command, baseline: float | None = None):
+    for _ in range(1000):
+        await call(msg)
+
+    start = perf_counter()
+    for _ in range(ROUNDS):
+        await call(msg)
+    elapsed = perf_counter() - start
+
+    per_call = elapsed / ROUNDS * 1e9
+    overhead = "" if baseline is None else f"  (+{per_call - baseline:.0f}ns)"
+    print(f"{label:<28}{per_call:>8.0f}ns/call{overhead}")
+    return per_call
+
+
+async def main():
+    registry = MessageRegistry(command_base=Command)
+    registry.register(direct, contexted)
+    aw = Anywise(registry)
+
+    baseline = await measure("raw function call", direct, Direct())
+    await measure("send, direct handler", aw.send, Direct(), baseline)
+    await measure("send, contexted handler", aw.send, Contexted(), baseline)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,135 @@
+import asyncio
+from dataclasses import dataclass
+from typing import AsyncGenerator
+
+import pytest
+
+from anywise import Anywise, MessageRegistry
+from anywise.batch import BatchPolicy
+from anywise.errors import BatchSizeMismatchError, InvalidMessageTypeError
+
+
+class Query: ...
+
+
+@dataclass
+class GetUser(Query):
+    user_id: int
+
+
+@dataclass
+class GetVipUser(GetUser): ...
+
+
+@dataclass
+class GetOrder(Query):
+    order_id: int
+
+
+async def test_concurrent_sends_are_batched():
+    batches: list[list[int]] = []
+
+    async def get_users(queries: list[GetUser]) -> list[str]:
+        batches.append([q.user_id for q in queries])
+        return [f"user-{q.user_id}" for q in queries]
+
+    registry = MessageRegistry(command_base=Query)
+    registry.register(get_users, batch=BatchPolicy(max_size=3))
+    aw = Anywise(registry)
+
+    results = await asyncio.gather(
+        *(aw.send(GetUser(i)) for i in range(4)), aw.send(GetVipUser(4))
+    )
+    assert results == [f"user-{i}" for i in range(5)]
+    assert batches == [[0, 1, 2], [3, 4]]
+
+
+async def test_batch_window():
+    batches: list[int] = []
+
+    class UserService:
+        async def get_users(self, queries: list[GetUser]) -> list[int]:
+            batches.append(len(queries))
+            return [q.user_id for q in queries]
+
+    registry = MessageRegistry(command_base=Query)
+    registry.register(UserService, batch=BatchPolicy(window=0.01))
+    aw = Anywise(registry)
+
+    async def delayed_send(i: int):
+        await asyncio.sleep(0)
+        return await aw.send(GetUser(i))
+
+    assert await asyncio.gather(aw.send(GetUser(0)), delayed_send(1)) == [0, 1]
+    assert batches == [2]
+
+
+class Connection:
+    def __init__(self):
+        self.closed = False
+
+
+async def test_batch_outlives_cancelled_opener():
+    closed: list[bool] = []
+    release = asyncio.Event()
+
+    registry = MessageRegistry(command_base=Query)
+
+    @registry.factory
+    async def conn_factory() -> AsyncGenerator[Connection, None]:
+        conn = Connection()
+        try:
+            yield conn
+        finally:
+            conn.closed = True
+
+    class UserService:
+        def __init__(self, conn: Connection):
+            self.conn = conn
+
+        async def get_users(self, queries: list[GetUser]) -> list[int]:
+            await release.wait()
+            closed.append(self.conn.closed)
+            return [q.user_id for q in queries]
+
+    registry.register(UserService, batch=BatchPolicy(max_size=2))
+    aw = Anywise(registry)
+
+    opener = asyncio.create_task(aw.send(GetUser(0)))
+    other = asyncio.create_task(aw.send(GetUser(1)))
+    await asyncio.sleep(0)
+    opener.cancel()
+    await asyncio.sleep(0)
+
+    release.set()
+    assert await other == 1
+    assert closed == [False]
+
+
+async def test_batch_errors_fan_out():
+    async def get_orders(queries: list[GetOrder]) -> list[int]:
+        return []
+
+    async def get_users(queries: list[GetUser]) -> list[int]:
+        raise ValueError
+
+    registry = MessageRegistry(command_base=Query)
+    registry.register(get_orders, get_users)
+    aw = Anywise(registry)
+
+    results = await asyncio.gather(
+        aw.send(GetOrder(1)), aw.send(GetUser(1)), return_exceptions=True
+    )
+    assert isinstance(results[0], BatchSizeMismatchError)
+    assert isinstance(results[1], ValueError)
+
+
+def test_batched_listener_not_supported():
+    async def on_users(events: list[GetUser]) -> None: ...
+
+    registry = MessageRegistry(event_base=Query)
+    registry.register(on_users)
+    assert not registry.event_mapping
+
+    with pytest.raises(InvalidMessageTypeError):
+        registry._register_eventlisteners(on_users)  # type: ignore
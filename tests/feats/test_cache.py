@@ -0,0 +1,92 @@
+import asyncio
+from dataclasses import dataclass
+
+from anywise import Anywise, MessageRegistry
+
+
+class Query: ...
+
+
+class Event: ...
+
+
+@dataclass(frozen=True)
+class ListTodos(Query):
+    owner: str
+
+
+@dataclass(frozen=True)
+class CountTodos(Query):
+    owner: str
+
+
+class TodoEvent(Event): ...
+
+
+class TodoCreated(TodoEvent): ...
+
+
+class UserEvent(Event): ...
+
+
+calls: list[Query] = []
+
+
+async def list_todos(query: ListTodos) -> list[str]:
+    calls.append(query)
+    return [query.owner]
+
+
+async def count_todos(query: CountTodos) -> int:
+    calls.append(query)
+    return len(calls)
+
+
+async def on_event(event: Event) -> None: ...
+
+
+def make_anywise(**cache_config) -> Anywise:
+    calls.clear()
+    registry = MessageRegistry(command_base=Query, event_base=Event)
+    registry.register(list_todos, count_todos, on_event)
+    registry.cache(ListTodos, **cache_config)
+    return Anywise(registry)
+
+
+async def test_cache_hit_and_miss():
+    aw = make_anywise(maxsize=1)
+
+    assert await aw.send(ListTodos("a")) == ["a"]
+    assert await aw.send(ListTodos("a")) == ["a"]
+    assert await aw.send(ListTodos("b")) == ["b"]
+    assert await aw.send(ListTodos("a")) == ["a"]
+    assert calls == [ListTodos("a"), ListTodos("b"), ListTodos("a")]
+
+    # not cached
+    await aw.send(CountTodos("a"))
+    await aw.send(CountTodos("a"))
+
+    stats = aw.inspect.caches()[ListTodos]
+    assert (stats.hits, stats.misses, stats.size) == (1, 3, 1)
+
+
+async def test_cache_ttl():
+    aw = make_anywise(ttl=0.01)
+
+    await aw.send(ListTodos("a"))
+    await asyncio.sleep(0.02)
+    await aw.send(ListTodos("a"))
+    assert len(calls) == 2
+
+
+async def test_cache_evicted_on_publish():
+    aw = make_anywise(evict_on=[TodoEvent])
+
+    await aw.send(ListTodos("a"))
+    await aw.publish(UserEvent())
+    await aw.send(ListTodos("a"))
+    assert len(calls) == 1
+
+    await aw.publish(TodoCreated())
+    await aw.send(ListTodos("a"))
+    assert len(calls) == 2
@@ -0,0 +1,74 @@
+import pytest
+
+from anywise import Anywise, BaseGuard, Context, IContext, MessageRegistry, SlotContext
+from tests.conftest import CreateUser, RemoveUser, UpdateUser, UserCommand
+
+
+class RequestContext(SlotContext):
+    __slots__ = ("request_id", "ip")
+
+
+class TracedContext(RequestContext):
+    __slots__ = "trace_id"
+
+
+def test_slot_context():
+    ctx = TracedContext(ip="127.0.0.1")
+    assert TracedContext._fields == ("request_id", "ip", "trace_id")
+    assert dict(ctx) == {"ip": "127.0.0.1"}
+    assert ctx.get("request_id") is None
+
+    ctx["trace_id"] = "t"
+    assert ctx.trace_id == "t"
+    assert len(ctx) == 2
+
+    with pytest.raises(KeyError):
+        ctx["unknown"] = 1
+    with pytest.raises(AttributeError):
+        ctx.__dict__
+
+
+class RequestIdGuard(BaseGuard):
+    def __init__(self):
+        super().__init__()
+
+    async def __call__(self, command: UserCommand, context: IContext):
+        context["request_id"] = "r1"
+        return await super().__call__(command, context)
+
+
+async def create_user(cmd: CreateUser, ctx: Context[RequestContext]) -> str:
+    return f"{ctx.request_id}@{ctx.ip}"
+
+
+async def test_send_with_slot_context():
+    registry = MessageRegistry(command_base=UserCommand)
+    registry.register(RequestIdGuard, create_user)
+
+    aw = Anywise(registry)
+    result = await aw.send(CreateUser("1", "a"), context=RequestContext(ip="::1"))
+    assert result == "r1@::1"
+
+
+class UserRepo: ...
+
+
+async def remove_user(cmd: RemoveUser, repo: UserRepo) -> str:
+    return cmd.user_name
+
+
+async def update_user(cmd: UpdateUser, ctx: Context[dict[str, str]]) -> str:
+    ctx["updated"] = cmd.new_name
+    return ctx["updated"]
+
+
+async def test_empty_context_shared_when_unread():
+    registry = MessageRegistry(command_base=UserCommand)
+    registry.register(remove_user, update_user)
+
+    aw = Anywise(registry)
+    assert aw._handler_manager.context_free == {RemoveUser}  # type: ignore
+    assert await aw.send(RemoveUser("1", "a")) == "a"
+    assert await aw.send(UpdateUser("1", "a", "b")) == "b"
+    async with aw.scope() as scope:
+        assert await aw.send_many([RemoveUser("1", "a")], scope=scope) == ["a"]
@@ -0,0 +1,99 @@
+import asyncio
+import os
+import threading
+
+import pytest
+
+from anywise import Anywise, MessageRegistry
+from anywise.errors import ExecutorNotFoundError
+from anywise.executor import ProcessExecutor, ThreadExecutor
+from tests.conftest import CreateUser, RemoveUser, UserCommand
+
+
+def current_thread_name(cmd: CreateUser) -> str:
+    return threading.current_thread().name
+
+
+def remove_user(cmd: RemoveUser) -> str:
+    return threading.current_thread().name
+
+
+def create_user_pid(cmd: CreateUser) -> tuple[int, str]:
+    return os.getpid(), cmd.user_name
+
+
+class UserRepo:
+    def __init__(self):
+        self.prefix = "repo"
+
+
+def create_user_in_repo(cmd: CreateUser, repo: UserRepo) -> str:
+    return f"{repo.prefix}:{cmd.user_name}"
+
+
+async def test_sync_handler_runs_in_registry_executor():
+    registry = MessageRegistry(command_base=UserCommand, executor="db")
+    registry.register(current_thread_name)
+    registry.register(remove_user, executor="cpu")
+
+    async with Anywise(registry, executors={"db": 2, "cpu": 1}) as aw:
+        assert (await aw.send(CreateUser("1", "a"))).startswith("anywise-db")
+        assert (await aw.send(RemoveUser("1", "a"))).startswith("anywise-cpu")
+
+
+async def test_sync_handler_runs_in_default_executor():
+    registry = MessageRegistry(command_base=UserCommand)
+    registry.register(current_thread_name)
+
+    async with Anywise(registry) as aw:
+        assert (await aw.send(CreateUser("1", "a"))).startswith("anywise-default")
+        assert set(aw.inspect.executors()) == {"default"}
+
+
+def test_unknown_executor():
+    registry = MessageRegistry(command_base=UserCommand, executor="db")
+    registry.register(current_thread_name)
+
+    with pytest.raises(ExecutorNotFoundError):
+        Anywise(registry)
+
+
+async def test_executor_stats():
+    executor = ThreadExecutor("test", max_workers=1)
+    release = threading.Event()
+
+    tasks = [asyncio.create_task(executor.run(release.wait)) for _ in range(3)]
+    while executor.stats.running != 1:
+        await asyncio.sleep(0.001)
+
+    stats = executor.stats
+    assert stats.pending == 2
+    assert stats.max_workers == 1
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert executor.stats.pending == executor.stats.running == 0
+    executor.shutdown()
+
+
+async def test_sync_handler_runs_in_process_executor():
+    registry = MessageRegistry(command_base=UserCommand)
+    registry.register(create_user_pid, executor="cpu")
+
+    executor = ProcessExecutor(max_workers=1)
+    async with Anywise(registry, executors={"cpu": executor}) as aw:
+        pid, name = await aw.send(CreateUser("1", "user"))
+        assert pid != os.getpid()
+        assert name == "user"
+        assert aw.inspect.executors()["cpu"].pending == 0
+
+
+@pytest.mark.parametrize("executor", [None, ProcessExecutor(max_workers=1)])
+async def test_sync_handler_dependencies_resolved_on_loop(
+    executor: ProcessExecutor | None,
+):
+    registry = MessageRegistry(command_base=UserCommand)
+    registry.register(create_user_in_repo)
+
+    async with Anywise(registry, executors={"default": executor}) as aw:
+        assert await aw.send(CreateUser("1", "user")) == "repo:user"
@@ -76,3 +76,115 @@ async def test_guard():
     aw = Anywise(user_registry, sink=InMemorySink())
     await aw.send(CreateUser("1", "2"))
     await aw.send(UpdateUser("1", "2", "3"))
+
+
+class TagGuard(BaseGuard):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    async def __call__(self, command: UserCommand, context: IContext):
+        self.calls += 1
+        return ("tagged", await super().__call__(command, context))
+
+
+async def create_user(cmd: CreateUser) -> str:
+    return "created"
+
+
+async def update_user(cmd: UpdateUser) -> str:
+    return "updated"
+
+
+async def test_shared_guard_is_not_rewired():
+    registry = MessageRegistry(command_base=UserCommand)
+    registry.register(create_user, update_user)
+    guard = TagGuard()
+    registry.add_guards(guard)
+
+    aw = Anywise(registry)
+    cmds = [CreateUser("1", "a"), UpdateUser("1", "a", "b")] * 20
+    results = await aw.send_many(cmds, concurrency=8)
+
+    assert results == [("tagged", "created"), ("tagged", "updated")] * 20
+    assert guard.calls == 40
+
+
+class UserService:
+    def __init__(self):
+        pass
+
+    async def create(self, cmd: CreateUser) -> str:
+        return "created"
+
+
+async def test_guard_state_kept_for_class_handlers():
+    registry = MessageRegistry(command_base=UserCommand)
+    registry.register(UserService)
+    guard = TagGuard()
+    registry.add_guards(guard)
+
+    aw = Anywise(registry)
+    for _ in range(3):
+        assert await aw.send(CreateUser("1", "a")) == ("tagged", "created")
+    assert guard.calls == 3
+
+
+class CountingGuard(BaseGuard):
+    created = 0
+
+    def __init__(self):
+        super().__init__()
+        type(self).created += 1
+        self.calls = 0
+
+    async def __call__(self, command: UserCommand, context: IContext):
+        self.calls += 1
+        return await super().__call__(command, context)
+
+
+class SingletonGuard(CountingGuard):
+    created = 0
+
+
+class ScopeGuard(CountingGuard):
+    created = 0
+
+
+class CallGuard(CountingGuard):
+    created = 0
+
+
+async def test_guard_lifetime():
+    registry = MessageRegistry(command_base=UserCommand)
+    registry.register(create_user, update_user)
+    registry.add_guards(SingletonGuard, lifetime="singleton")
+    registry.add_guards(ScopeGuard)
+    registry.add_guards(CallGuard, lifetime="call")
+
+    aw = Anywise(registry)
+    assert SingletonGuard.created == 1
+
+    await aw.send(CreateUser("1", "a"))
+    await aw.send(UpdateUser("1", "a", "b"))
+    assert (SingletonGuard.created, ScopeGuard.created, CallGuard.created) == (1, 2, 2)
+
+    async with aw.scope() as scope:
+        await aw.send(CreateUser("1", "a"), scope=scope)
+        await aw.send(CreateUser("1", "a"), scope=scope)
+    assert (SingletonGuard.created, ScopeGuard.created, CallGuard.created) == (1, 3, 4)
+
+    assert aw.graph.resolve(SingletonGuard).calls == 4
+
+
+async def test_singleton_guard_shared_by_class_handlers():
+    registry = MessageRegistry(command_base=UserCommand)
+    registry.register(UserService, update_user)
+    registry.add_guards(SingletonGuard, lifetime="singleton")
+    aw = Anywise(registry)
+
+    for _ in range(3):
+        await aw.send(CreateUser("1", "a"))
+        await aw.send(UpdateUser("1", "a", "b"))
+
+    assert aw.graph.resolve(SingletonGuard).calls == 6
@@ -0,0 +1,203 @@
+import asyncio
+from dataclasses import dataclass
+
+import pytest
+
+from anywise import Anywise, MessageRegistry, bounded_publish
+from anywise.sink import InMemorySink
+from anywise.strategies import default_publish
+from tests.conftest import (
+    CreateUser,
+    UpdateUser,
+    UserCommand,
+    UserCreated,
+    UserEvent,
+    UserNameUpdated,
+)
+
+
+async def test_bounded_publish_limits_in_flight():
+    in_flight = peak = 0
+
+    async def listener(event: UserCreated, _: object):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+
+    publish = bounded_publish(max_concurrency=2)
+    await publish(UserCreated("a"), None, [listener] * 6)
+    assert peak == 2
+
+
+async def test_bounded_publish_fail_fast():
+    called: list[str] = []
+
+    async def fail(event: UserCreated, _: object):
+        raise ValueError("boom")
+
+    async def slow(event: UserCreated, _: object):
+        await asyncio.sleep(1)
+        called.append("slow")
+
+    publish = bounded_publish(max_concurrency=2)
+    with pytest.raises(ValueError):
+        await publish(UserCreated("a"), None, [fail, slow])
+    assert not called
+
+
+async def test_bounded_publish_collects_errors_and_timeouts():
+    called: list[str] = []
+
+    async def fail(event: UserCreated, _: object):
+        raise ValueError("boom")
+
+    async def slow(event: UserCreated, _: object):
+        await asyncio.sleep(1)
+
+    async def ok(event: UserCreated, _: object):
+        called.append("ok")
+
+    publish = bounded_publish(fail_fast=False, listener_timeout=0.01)
+    with pytest.raises(ExceptionGroup) as exc_info:
+        await publish(UserCreated("a"), None, [fail, slow, ok])
+
+    errors = {type(exc) for exc in exc_info.value.exceptions}
+    assert errors == {ValueError, TimeoutError}
+    assert called == ["ok"]
+
+
+async def test_publish_strategy_per_event_type():
+    published: list[type] = []
+
+    async def on_user_event(event: UserEvent): ...
+
+    async def recording_publish(msg, context, listeners):
+        published.append(type(msg))
+        await default_publish(msg, context, listeners)
+
+    registry = MessageRegistry(event_base=UserEvent)
+    registry.register(on_user_event)
+    registry.publish_strategy(UserCreated, publisher=recording_publish)
+
+    aw = Anywise(registry)
+    await aw.publish(UserCreated("a"))
+    await aw.publish(UserNameUpdated("b"))
+    assert published == [UserCreated]
+
+
+async def test_deferred_events_flushed_after_command():
+    published: list[UserEvent] = []
+
+    async def on_user_event(event: UserEvent):
+        published.append(event)
+
+    async def create_user(cmd: CreateUser, anywise: Anywise) -> int:
+        await anywise.publish(UserCreated(cmd.user_name))
+        await anywise.send(UpdateUser(cmd.user_id, cmd.user_name, "new"))
+        assert not published
+        return len(published)
+
+    async def update_user(cmd: UpdateUser, anywise: Anywise):
+        await anywise.publish(UserNameUpdated(cmd.new_name))
+        if cmd.new_name == "fail":
+            raise ValueError(cmd.new_name)
+
+    registry = MessageRegistry(command_base=UserCommand, event_base=UserEvent)
+    registry.register(on_user_event, create_user, update_user)
+
+    sink = InMemorySink[UserEvent]()
+    aw = Anywise(registry, sink=sink, defer_events=True)  # type: ignore
+
+    assert await aw.send(CreateUser("1", "a")) == 0
+    assert published == [UserCreated("a"), UserNameUpdated("new")]
+    assert len(sink) == 2
+
+    with pytest.raises(ValueError):
+        await aw.send(UpdateUser("1", "a", "fail"))
+    assert len(published) == 2
+
+
+async def test_deferred_events_only_buffer_own_publishes():
+    received: list[str] = []
+
+    async def on_created(event: UserCreated):
+        received.append(event.user_name)
+
+    other_registry = MessageRegistry(event_base=UserEvent)
+    other_registry.register(on_created)
+    other = Anywise(other_registry)
+
+    async def create_user(cmd: CreateUser):
+        await other.publish(UserCreated(cmd.user_name))
+        assert received == [cmd.user_name]
+
+    registry = MessageRegistry(command_base=UserCommand)
+    registry.register(create_user)
+    aw = Anywise(registry, defer_events=True)
+
+    await aw.send(CreateUser("1", "a"))
+    assert received == ["a"]
+
+
+async def test_send_many_defers_events_per_message():
+    published: list[UserEvent] = []
+
+    async def on_user_event(event: UserEvent):
+        published.append(event)
+
+    async def create_user(cmd: CreateUser, anywise: Anywise):
+        await anywise.publish(UserCreated(cmd.user_name))
+        assert not published
+        if cmd.user_name == "fail":
+            raise ValueError(cmd.user_name)
+
+    registry = MessageRegistry(command_base=UserCommand, event_base=UserEvent)
+    registry.register(on_user_event, create_user)
+    aw = Anywise(registry, defer_events=True)
+
+    results = await aw.send_many([CreateUser("1", "fail"), CreateUser("2", "b")])
+    assert isinstance(results[0], ValueError)
+    assert published == [UserCreated("b")]
+
+
+@dataclass
+class Progress(UserEvent):
+    entity_id: str
+    percent: int
+
+
+@dataclass
+class Counted(UserEvent):
+    entity_id: str
+    count: int
+
+
+async def test_coalesce_events_per_entity():
+    received: list[UserEvent] = []
+
+    async def on_event(event: Progress | Counted):
+        received.append(event)
+
+    registry = MessageRegistry(event_base=UserEvent)
+    registry.register(on_event)
+    registry.coalesce(Progress, window=0.01)
+    registry.coalesce(
+        Counted,
+        window=10,
+        merge=lambda old, new: Counted(new.entity_id, old.count + new.count),
+    )
+
+    aw = Anywise(registry)
+    for percent in range(100):
+        await aw.publish(Progress("a", percent))
+        await aw.publish(Progress("b", percent))
+        await aw.publish(Counted("a", 1))
+    assert not received
+
+    await asyncio.sleep(0.05)
+    assert received == [Progress("a", 99), Progress("b", 99)]
+
+    await aw.shutdown()
+    assert received[-1] == Counted("a", 100)
@@ -0,0 +1,77 @@
+from anywise import Anywise, MessageRegistry
+from anywise.retry import DeadLetter, RetryPolicy
+from anywise.sink import InMemorySink
+from tests.conftest import UserCreated, UserEvent
+
+attempts: dict[str, int] = {"flaky": 0, "broken": 0}
+sync_attempts: dict[str, int] = {"function": 0, "method": 0}
+
+
+async def flaky(event: UserCreated):
+    attempts["flaky"] += 1
+    if attempts["flaky"] < 3:
+        raise ConnectionError("flaky")
+
+
+async def broken(event: UserCreated):
+    attempts["broken"] += 1
+    raise ConnectionError("broken")
+
+
+def broken_sync(event: UserCreated):
+    sync_attempts["function"] += 1
+    raise ConnectionError("sync")
+
+
+class Mailer:
+    def __init__(self):
+        pass
+
+    def on_created(self, event: UserCreated):
+        sync_attempts["method"] += 1
+        raise ConnectionError("method")
+
+
+def test_backoff():
+    policy = RetryPolicy(base_delay=0.1, max_delay=0.3, jitter=False)
+    assert [policy.backoff(n) for n in (1, 2, 3)] == [0.1, 0.2, 0.3]
+    assert 0 <= RetryPolicy(base_delay=0.1).backoff(2) <= 0.2
+
+
+async def test_failed_deliveries_are_retried_then_dead_lettered():
+    registry = MessageRegistry(event_base=UserEvent)
+    registry.register(
+        flaky, broken, retry=RetryPolicy(max_attempts=3, base_delay=0.001)
+    )
+
+    dead_letter = InMemorySink[DeadLetter]()
+    aw = Anywise(registry, dead_letter=dead_letter)  # type: ignore
+
+    event = UserCreated("a")
+    await aw.publish(event)
+    assert attempts == {"flaky": 1, "broken": 1}
+
+    await aw.shutdown()
+    assert attempts == {"flaky": 3, "broken": 3}
+
+    [dead] = dead_letter.drain()
+    assert dead.event == event
+    assert dead.listener == "broken"
+    assert dead.attempts == 3
+
+
+async def test_dead_letters_of_sync_and_method_listeners():
+    registry = MessageRegistry(event_base=UserEvent)
+    registry.register(
+        broken_sync, Mailer, retry=RetryPolicy(max_attempts=2, base_delay=0.001)
+    )
+
+    dead_letter = InMemorySink[DeadLetter]()
+    aw = Anywise(registry, dead_letter=dead_letter)  # type: ignore
+
+    await aw.publish(UserCreated("a"))
+    await aw.shutdown()
+    assert sync_attempts == {"function": 2, "method": 2}
+
+    listeners = {dead.listener for dead in dead_letter.drain()}
+    assert listeners == {"broken_sync", "Mailer.on_created"}
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from anywise import Anywise, MessageRegistry
+from anywise.errors import RuntimeClosedError
+from anywise.runtime import Runtime
+from tests.conftest import UserCreated, UserEvent
+
+
+async def test_background_publish_returns_immediately():
+    started = asyncio.Event()
+    release = asyncio.Event()
+    done: list[str] = []
+
+    async def on_created(event: UserCreated):
+        started.set()
+        await release.wait()
+        done.append(event.user_name)
+
+    registry = MessageRegistry(event_base=UserEvent)
+    registry.register(on_created)
+
+    aw = Anywise(registry)
+    await aw.publish(UserCreated("a"), background=True)
+    await started.wait()
+    assert not done
+    assert aw.inspect.runtime().running == 1  # type: ignore
+
+    release.set()
+    await aw.shutdown()
+    assert done == ["a"]
+
+    with pytest.raises(RuntimeClosedError):
+        await aw.publish(UserCreated("b"), background=True)
+
+
+async def test_runtime_reports_failures_and_bounds_concurrency():
+    failures: list[tuple[object, Exception]] = []
+    in_flight = peak = 0
+
+    async def on_error(message: object, exc: Exception):
+        failures.append((message, exc))
+
+    async def job(fail: bool):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+        if fail:
+            raise ValueError(fail)
+
+    runtime = Runtime(max_concurrency=2, on_error=on_error)
+    for i in range(5):
+        runtime.spawn(job(i == 3), message=i)
+    assert runtime.stats.pending == 5
+
+    await runtime.drain()
+    assert peak == 2
+    assert [(msg, type(exc)) for msg, exc in failures] == [(3, ValueError)]
+    assert runtime.stats.failed == 1
+
+
+async def test_runtime_shutdown_cancels_after_timeout():
+    cancelled = False
+
+    async def hang():
+        nonlocal cancelled
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+
+    runtime = Runtime()
+    runtime.spawn(hang())
+    await asyncio.sleep(0)
+    await runtime.shutdown(timeout=0.01)
+    assert cancelled
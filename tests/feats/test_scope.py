@@ -0,0 +1,130 @@
+import os
+import tracemalloc
+from typing import AsyncGenerator
+
+import pytest
+
+from anywise import Anywise, MessageRegistry, _scope
+from tests.conftest import CreateUser, UserCommand
+
+LEAK_ROUNDS = int(os.environ.get("ANYWISE_LEAK_ROUNDS") or 10_000)
+"the soak test only runs if `ANYWISE_LEAK_ROUNDS` is set, e.g. to 1_000_000"
+
+
+class Connection:
+    def __init__(self):
+        self.closed = False
+
+
+class Counter:
+    opened: int = 0
+    closed: int = 0
+
+
+def make_registry() -> MessageRegistry[UserCommand, None]:
+    registry = MessageRegistry(command_base=UserCommand)
+
+    @registry.factory
+    async def conn_factory() -> AsyncGenerator[Connection, None]:
+        conn = Connection()
+        Counter.opened += 1
+        try:
+            yield conn
+        finally:
+            conn.closed = True
+            Counter.closed += 1
+
+    class UserService:
+        def __init__(self, conn: Connection):
+            self.conn = conn
+
+        async def create_user(self, cmd: CreateUser) -> Connection:
+            return self.conn
+
+    registry.register(UserService)
+    return registry
+
+
+@pytest.fixture(autouse=True)
+def reset_counter():
+    Counter.opened = Counter.closed = 0
+
+
+@pytest.mark.parametrize("pool_size", [0, 4])
+async def test_message_scope_closed_after_send(pool_size: int):
+    aw = Anywise(make_registry(), scope_pool_size=pool_size)
+
+    conn = await aw.send(CreateUser("1", "user"))
+    assert conn.closed
+    assert Counter.opened == Counter.closed == 1
+
+
+async def test_message_scope_closed_on_error():
+    registry = MessageRegistry(command_base=UserCommand)
+
+    @registry.factory
+    async def conn_factory() -> AsyncGenerator[Connection, None]:
+        Counter.opened += 1
+        try:
+            yield Connection()
+        finally:
+            Counter.closed += 1
+
+    class UserService:
+        def __init__(self, conn: Connection): ...
+
+        async def create_user(self, cmd: CreateUser):
+            raise ValueError
+
+    registry.register(UserService)
+    aw = Anywise(registry, scope_pool_size=1)
+
+    with pytest.raises(ValueError):
+        await aw.send(CreateUser("1", "user"))
+
+    assert Counter.opened == Counter.closed == 1
+    assert aw._scope_pool.idle == 1  # type: ignore
+
+
+async def test_pooled_scope_reused():
+    aw = Anywise(make_registry(), scope_pool_size=1)
+
+    first = await aw.send(CreateUser("1", "user"))
+    second = await aw.send(CreateUser("1", "user"))
+    assert first is not second
+    assert aw._scope_pool.idle == 1  # type: ignore
+
+
+async def test_pooling_falls_back_on_unsupported_ididi(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(_scope, "POOLING_SUPPORTED", False)
+    aw = Anywise(make_registry(), scope_pool_size=1)
+
+    conn = await aw.send(CreateUser("1", "user"))
+    assert conn.closed
+    assert aw._scope_pool.idle == 0  # type: ignore
+
+
+@pytest.mark.skipif(
+    "ANYWISE_LEAK_ROUNDS" not in os.environ, reason="set ANYWISE_LEAK_ROUNDS to run"
+)
+async def test_send_does_not_leak():
+    aw = Anywise(make_registry(), scope_pool_size=16)
+    cmd = CreateUser("1", "user")
+
+    warmup = min(LEAK_ROUNDS // 10, 10_000)
+    for _ in range(warmup):
+        await aw.send(cmd)
+
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        for _ in range(LEAK_ROUNDS):
+            await aw.send(cmd)
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert Counter.opened == Counter.closed == warmup + LEAK_ROUNDS
+    assert after - before < 1024 * 1024
@@ -0,0 +1,117 @@
+import asyncio
+from dataclasses import dataclass
+from typing import AsyncGenerator
+
+from anywise import Anywise, MessageRegistry
+
+
+class Query: ...
+
+
+@dataclass(frozen=True)
+class ListTodos(Query):
+    owner: str
+
+
+@dataclass(frozen=True)
+class ListDoneTodos(ListTodos): ...
+
+
+@dataclass
+class GetTodo(Query):
+    todo_id: str
+
+
+async def test_identical_queries_share_execution():
+    calls: list[str] = []
+    release = asyncio.Event()
+
+    async def list_todos(query: ListTodos) -> list[str]:
+        calls.append(query.owner)
+        await release.wait()
+        return [query.owner]
+
+    async def get_todo(query: GetTodo) -> str:
+        calls.append(query.todo_id)
+        await release.wait()
+        return query.todo_id
+
+    registry = MessageRegistry(command_base=Query)
+    registry.register(list_todos, get_todo)
+    registry.single_flight(ListTodos, GetTodo)
+    aw = Anywise(registry)
+
+    tasks = [
+        asyncio.create_task(aw.send(q))
+        for q in [ListTodos("a"), ListTodos("a"), ListTodos("b"), ListDoneTodos("a")]
+    ]
+    # GetTodo is unhashable, it is never coalesced
+    tasks += [asyncio.create_task(aw.send(GetTodo("1"))) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    tasks[0].cancel()
+    release.set()
+    results = await asyncio.gather(*tasks[1:])
+
+    assert results == [["a"], ["b"], ["a"], "1", "1"]
+    assert sorted(calls) == ["1", "1", "a", "a", "b"]
+
+
+async def test_single_flight_is_opt_in():
+    calls = 0
+
+    async def list_todos(query: ListTodos) -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0)
+        return calls
+
+    registry = MessageRegistry(command_base=Query)
+    registry.register(list_todos)
+    aw = Anywise(registry)
+
+    await asyncio.gather(aw.send(ListTodos("a")), aw.send(ListTodos("a")))
+    assert calls == 2
+
+
+class Connection:
+    def __init__(self):
+        self.closed = False
+
+
+async def test_shared_execution_outlives_cancelled_caller():
+    closed: list[bool] = []
+    release = asyncio.Event()
+
+    registry = MessageRegistry(command_base=Query)
+
+    @registry.factory
+    async def conn_factory() -> AsyncGenerator[Connection, None]:
+        conn = Connection()
+        try:
+            yield conn
+        finally:
+            conn.closed = True
+
+    class TodoService:
+        def __init__(self, conn: Connection):
+            self.conn = conn
+
+        async def list_todos(self, query: ListTodos) -> list[str]:
+            await release.wait()
+            closed.append(self.conn.closed)
+            return [query.owner]
+
+    registry.register(TodoService)
+    registry.single_flight(ListTodos)
+    aw = Anywise(registry)
+
+    first = asyncio.create_task(aw.send(ListTodos("a")))
+    second = asyncio.create_task(aw.send(ListTodos("a")))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+
+    release.set()
+    assert await second == ["a"]
+    assert closed == [False]
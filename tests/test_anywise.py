@@ -1,5 +1,6 @@
+import asyncio
 from dataclasses import dataclass
-from typing import Mapping
+from typing import AsyncGenerator, Mapping
 
 import pytest
 
@@ -288,3 +289,202 @@ async def test_send_to_function(asynwise: Anywise):
 async def test_event_handler(asynwise: Anywise):
     event = UserCreated("new_name")
     await asynwise.publish(event)
+
+
+async def test_dispatch_plan_compiled_once():
+    mr = MessageRegistry(command_base=str)
+    mr.register(handler)
+    aw = Anywise(mr)
+    manager = aw._handler_manager  # type: ignore
+
+    async with aw.scope("message") as scope:
+        first = await manager.resolve_handler(str, scope)
+        second = await manager.resolve_handler(str, scope)
+    assert first is second
+
+    aw.include(MessageRegistry(command_base=str))
+    async with aw.scope("message") as scope:
+        assert await manager.resolve_handler(str, scope) is not first
+
+
+async def test_dispatch_to_subclass_defined_after_registration():
+    class Command: ...
+
+    class CreateOrder(Command): ...
+
+    class Event: ...
+
+    class OrderCreated(Event): ...
+
+    calls: list[str] = []
+
+    async def handle_command(cmd: Command) -> str:
+        return "base"
+
+    async def handle_create(cmd: CreateOrder) -> str:
+        return "create"
+
+    async def listen_event(event: Event) -> None:
+        calls.append("base")
+
+    async def listen_created(event: OrderCreated | Event) -> None:
+        calls.append("created")
+
+    mr = MessageRegistry(command_base=Command, event_base=Event)
+    mr.register(handle_command, handle_create, listen_event, listen_created)
+    aw = Anywise(mr)
+
+    class CancelOrder(Command): ...
+
+    class CreateRushOrder(CreateOrder): ...
+
+    class RushOrderCreated(OrderCreated): ...
+
+    assert await aw.send(CancelOrder()) == "base"
+    assert await aw.send(CreateRushOrder()) == "create"
+    assert aw.inspect.handler(CreateRushOrder) is handle_create
+
+    await aw.publish(RushOrderCreated())
+    assert calls == ["base", "created"]
+    assert CreateRushOrder in aw._handler_manager._plans  # type: ignore
+
+
+async def test_listener_fanout_precomputed_for_existing_subclasses():
+    class Event: ...
+
+    class OrderEvent(Event): ...
+
+    class OrderShipped(OrderEvent): ...
+
+    calls: list[str] = []
+
+    async def audit(event: Event) -> None:
+        calls.append("audit")
+
+    async def on_order(event: OrderEvent) -> None:
+        calls.append("order")
+
+    mr = MessageRegistry(event_base=Event)
+    mr.register(audit, on_order)
+    aw = Anywise(mr)
+    plans = aw._listener_manager._plans  # type: ignore
+
+    assert len(plans[OrderShipped]) == 2
+
+    class OrderCancelled(OrderEvent): ...
+
+    assert OrderCancelled not in plans
+    await aw.publish(OrderCancelled())
+    assert calls == ["audit", "order"]
+    assert len(plans[OrderCancelled]) == 2
+
+
+async def test_send_many():
+    class Command: ...
+
+    @dataclass
+    class Double(Command):
+        n: int
+
+    @dataclass
+    class Fail(Command):
+        n: int
+
+    in_flight = max_in_flight = 0
+
+    async def double(cmd: Double) -> int:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(in_flight, max_in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return cmd.n * 2
+
+    async def fail(cmd: Fail) -> int:
+        raise ValueError(cmd.n)
+
+    mr = MessageRegistry(command_base=Command)
+    mr.register(double, fail)
+    aw = Anywise(mr)
+
+    msgs = [Double(1), Fail(2), Double(3), Double(4), Double(5)]
+    results = await aw.send_many(msgs, concurrency=2)
+
+    assert results[0] == 2 and results[2:] == [6, 8, 10]
+    assert isinstance(results[1], ValueError)
+    assert max_in_flight == 2
+
+    with pytest.raises(ValueError):
+        await aw.send_many(msgs, return_exceptions=False, concurrency=2)
+
+    results = await aw.send_many([Double(1), object()])
+    assert isinstance(results[1], UnregisteredMessageError)
+
+
+async def test_send_many_scopes_each_message():
+    @dataclass
+    class Query:
+        n: int
+
+    class Conn:
+        in_use = False
+
+    opened: list[Conn] = []
+    registry = MessageRegistry(command_base=Query)
+
+    @registry.factory
+    async def conn_factory() -> AsyncGenerator[Conn, None]:
+        conn = Conn()
+        opened.append(conn)
+        yield conn
+
+    class QueryService:
+        def __init__(self, conn: Conn):
+            self.conn = conn
+
+        async def query(self, query: Query) -> int:
+            assert not self.conn.in_use, "connection used concurrently"
+            self.conn.in_use = True
+            await asyncio.sleep(0)
+            self.conn.in_use = False
+            return query.n
+
+    registry.register(QueryService)
+    aw = Anywise(registry)
+
+    results = await aw.send_many([Query(n) for n in range(6)], concurrency=3)
+    assert results == list(range(6))
+    assert len(opened) == 6
+
+    async with aw.scope() as scope:
+        results = await aw.send_many([Query(n) for n in range(6)], scope=scope)
+    assert results == list(range(6))
+    assert len(opened) == 7
+
+
+async def remove_user_directly(cmd: RemoveUser) -> str:
+    return cmd.user_name
+
+
+async def create_user_with_context(cmd: CreateUser, ctx: Context[dict[str, str]]):
+    return cmd.user_name
+
+
+async def test_send_calls_unguarded_handler_directly():
+    mr = MessageRegistry(command_base=UserCommand)
+    mr.register(remove_user_directly, create_user_with_context)
+    aw = Anywise(mr)
+    direct = aw._handler_manager.direct_handlers  # type: ignore
+
+    assert direct == {RemoveUser: remove_user_directly}
+    assert await aw.send(RemoveUser("1", "user")) == "user"
+
+    sent: list[object] = []
+
+    async def sender(msg: object, context: object, handler: object):
+        sent.append(msg)
+        return await default_send(msg, context, handler)  # type: ignore
+
+    aw = Anywise(mr, sender=sender)
+    assert await aw.send(RemoveUser("1", "user")) == "user"
+    assert len(sent) == 1
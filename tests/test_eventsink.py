@@ -2,12 +2,23 @@
 EventSink is a port to
 """
 
+import asyncio
+import os
+import threading
+from typing import Any
+
 import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
 
 from anywise import Anywise, MessageRegistry
 from anywise.errors import SinkUnsetError
 from anywise.messages import Event, IEvent
-from anywise.sink import InMemorySink
+from anywise.messages import EventStore
+from anywise.messages.table import create_tables
+from anywise.sink import BatchingSink, InMemorySink
+from anywise.sink.db import DBSink
+from anywise.sink.file import FileSink
+from anywise.sink.spill import SpillingSink, encode_event
 
 reg = MessageRegistry(event_base=Event)
 
@@ -35,7 +46,7 @@ async def test_sink_event(user_created: UserCreated):
     sink = InMemorySink[IEvent]()
     aw = Anywise(reg, sink=sink)
     await aw.publish(user_created)
-    assert sink.queue.qsize() == 1
+    assert len(sink) == 1
 
 
 async def test_sink_multiple_event():
@@ -47,4 +58,259 @@ async def test_sink_multiple_event():
         UserCreated(entity_id="3"),
     ]
     await aw.sink(events)
-    assert sink.queue.qsize() == len(events)
+    assert sink.drain() == events
+
+
+class RecordingSink:
+    def __init__(self):
+        self.batches: list[list[IEvent]] = []
+
+    async def sink(self, event: IEvent | list[IEvent]):
+        self.batches.append(list(event) if isinstance(event, list) else [event])
+
+
+async def test_batching_sink_flushes_on_size_and_delay():
+    inner = RecordingSink()
+    sink = BatchingSink[IEvent](inner, max_size=3, max_delay=0.01)
+
+    await sink.sink([UserCreated(entity_id=str(i)) for i in range(2)])
+    await sink.sink(UserCreated(entity_id="2"))
+    assert [len(b) for b in inner.batches] == [3]
+
+    await sink.sink(UserCreated(entity_id="3"))
+    assert sink.pending == 1
+    await asyncio.sleep(0.05)
+    assert [len(b) for b in inner.batches] == [3, 1]
+
+
+class FlakySink(RecordingSink):
+    def __init__(self, failures: int):
+        super().__init__()
+        self.failures = failures
+        self.attempts = 0
+
+    async def sink(self, event: IEvent | list[IEvent]):
+        self.attempts += 1
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("sink unavailable")
+        await super().sink(event)
+
+
+async def test_batching_sink_keeps_batch_on_failure():
+    inner = FlakySink(failures=1)
+    sink = BatchingSink[IEvent](inner, max_size=2, max_delay=0.01)
+    events = [UserCreated(entity_id=str(i)) for i in range(3)]
+
+    with pytest.raises(ConnectionError):
+        await sink.sink(events[:2])
+    assert sink.pending == 2
+
+    await sink.sink(events[2])
+    assert inner.batches == [events]
+
+    inner.failures = 1
+    await sink.sink(events[0])
+    await asyncio.sleep(0.05)
+    assert inner.batches == [events, events[:1]]
+
+
+async def test_batching_sink_backs_off_and_caps_pending():
+    inner = FlakySink(failures=1000)
+    sink = BatchingSink[IEvent](
+        inner, max_size=10, max_delay=0.01, max_backoff=0.04, max_pending=3
+    )
+    events = [UserCreated(entity_id=str(i)) for i in range(5)]
+
+    await sink.sink(events)
+    assert sink.pending == 3 and sink.dropped == 2
+
+    reported: list[dict[str, Any]] = []
+    loop = asyncio.get_running_loop()
+    loop.set_exception_handler(lambda _, context: reported.append(context))
+    try:
+        await asyncio.sleep(0.1)
+        # flushed after 0.01, then retried after 0.02, 0.04, 0.04
+        assert 2 <= inner.attempts <= 4
+        assert len(reported) == inner.attempts
+
+        with pytest.raises(ConnectionError):
+            await sink.close()
+        attempts = inner.attempts
+        await asyncio.sleep(0.1)
+        assert inner.attempts == attempts
+        assert sink.pending == 3
+    finally:
+        loop.set_exception_handler(None)
+
+
+class ClosingSink(RecordingSink):
+    def __init__(self):
+        super().__init__()
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+async def test_shutdown_closes_every_sink_despite_failures():
+    dead_letter = ClosingSink()
+    aw = Anywise(
+        reg,
+        sink=BatchingSink(FlakySink(failures=1), max_delay=10),
+        dead_letter=dead_letter,
+    )
+    await aw.sink(UserCreated(entity_id="1"))
+
+    with pytest.raises(ExceptionGroup) as exc_info:
+        await aw.shutdown()
+    assert isinstance(exc_info.value.exceptions[0], ConnectionError)
+    assert dead_letter.closed
+    assert aw._executors["default"]._pool._shutdown  # type: ignore
+
+
+async def test_batching_sink_flushed_on_shutdown(user_created: UserCreated):
+    inner = RecordingSink()
+    aw = Anywise(reg, sink=BatchingSink(inner, max_delay=10))
+    await aw.sink(user_created)
+    assert not inner.batches
+
+    await aw.shutdown()
+    assert inner.batches == [[user_created]]
+
+
+async def test_in_memory_sink_overflow():
+    events = [UserCreated(entity_id=str(i)) for i in range(5)]
+
+    oldest = InMemorySink[IEvent](3, overflow="drop_oldest")
+    await oldest.sink(events)
+    assert oldest.drain() == events[2:]
+    assert oldest.dropped == 2
+
+    newest = InMemorySink[IEvent](3, overflow="drop_newest")
+    await newest.sink(events)
+    assert newest.drain() == events[:3]
+
+    blocking = InMemorySink[IEvent](3)
+    task = asyncio.create_task(blocking.sink(events))
+    await asyncio.sleep(0)
+    assert not task.done() and len(blocking) == 3
+
+    assert blocking.drain(2) == events[:2]
+    await task
+    assert blocking.drain() == events[2:]
+
+
+async def test_in_memory_sink_batches():
+    sink = InMemorySink[IEvent]()
+    events = [UserCreated(entity_id=str(i)) for i in range(5)]
+    await sink.sink(events)
+
+    batches = sink.batches(max_n=3)
+    assert await anext(batches) == events[:3]
+    assert await anext(batches) == events[3:]
+
+    pending = asyncio.ensure_future(anext(batches))
+    await asyncio.sleep(0)
+    assert not pending.done()
+    await sink.sink(events[0])
+    assert await pending == [events[0]]
+    await batches.aclose()
+
+
+async def test_spilling_sink(tmp_path):
+    path = tmp_path / "events.spill"
+    sink = SpillingSink[IEvent](path, volume=2)
+    events = [UserCreated(entity_id=str(i)) for i in range(5)]
+
+    await sink.sink(events[:3])
+    await sink.sink(events[3:])
+    assert len(sink) == 5 and sink.spilled == 3
+
+    assert sink.drain(1) == events[:1]
+    assert sink.spilled == 2
+
+    await sink.close()
+    sink = SpillingSink[IEvent](path, volume=2)
+    assert sink.drain() == events[1:3]
+    assert sink.drain() == events[3:]
+    assert not path.read_bytes()
+
+
+async def test_file_sink(tmp_path):
+    sink = FileSink[IEvent](tmp_path, segment_bytes=256)
+    events = [UserCreated(entity_id=str(i)) for i in range(10)]
+
+    await sink.sink(events[:4])
+    await sink.close()
+
+    sink = FileSink[IEvent](tmp_path, segment_bytes=256)
+    assert sink.next_offset == 4
+    await sink.sink(events[4:])
+    assert sink.next_offset == 10
+
+    reader = sink.reader()
+    assert len(reader.segments()) > 1
+    assert list(reader.read()) == events
+    assert list(reader.read(offset=7)) == events[7:]
+    assert list(reader.read(offset=10)) == []
+    assert all(isinstance(frame, memoryview) for frame in reader.frames(5))
+
+    frames = reader.frames()
+    first = next(frames)
+    assert bytes(first) == encode_event(events[0])
+    next(frames)
+    with pytest.raises(ValueError):
+        bytes(first)  # released once the next frame is requested
+    frames.close()
+    await sink.close()
+
+
+async def test_file_sink_fsync(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    threads: set[str] = set()
+    fsync = os.fsync
+
+    def recording_fsync(fd: int) -> None:
+        threads.add(threading.current_thread().name)
+        fsync(fd)
+
+    monkeypatch.setattr(os, "fsync", recording_fsync)
+    sink = FileSink[IEvent](tmp_path, fsync=True)
+    events = [UserCreated(entity_id=str(i)) for i in range(3)]
+    await sink.sink(events)
+    await sink.close()
+    assert list(sink.reader().read()) == events
+    assert len(threads) == 1 and threads.pop().startswith("anywise-filesink")
+
+
+async def test_db_sink(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'events.db'}")
+    await create_tables(engine)
+    store = EventStore(engine)
+    sink = DBSink(store)
+
+    events = [UserCreated(entity_id="1") for _ in range(3)]
+    await sink.sink(events)
+    await sink.sink(UserCreated(entity_id="2"))
+
+    assert await store.list_events("1") == events
+    assert len(await store.list_events("2")) == 1
+    await engine.dispose()
+
+
+async def test_event_store_add_many_in_caller_transaction(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'events.db'}")
+    await create_tables(engine)
+    store = EventStore(engine)
+    events = [UserCreated(entity_id="1") for _ in range(3)]
+
+    async with engine.connect() as conn:
+        await conn.begin()
+        await store.add_many(events, conn=conn)
+        await conn.rollback()
+    assert await store.list_events("1") == []
+
+    async with engine.begin() as conn:
+        await store.add_many(events, conn=conn)
+    assert await store.list_events("1") == events
+    await engine.dispose()